@@ -0,0 +1,152 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Diagnostics import dump_expressions
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from LogicalComputation.Solve_Stats import SolveStats
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+
+
+# Headless entry point: one JSON request per input line, one JSON result per output line, same order.
+#   {"request_id": "a", "graph": {"R": {"X1": "G1"}, "X1": {"X1": "-H", "C": "G2"}}}
+#   {"request_id": "b", "coeffs": [1, 2, 3, 4, 5]}
+# Graph gains are SymPy strings; results carry expressions as strings.
+# "stats": true in a request adds the per-stage timings and counts of that solve to its result.
+
+
+def solve_graph(adjacency, stats=None):
+    extractor = solver(CompactGraph.from_dict(adjacency), stats=stats)
+    extractor.extract_paths_and_loops()
+    paths, loops = extractor.paths, extractor.loops
+
+    delta, deltas, non_touching_loops, result = SignalFlowAnalyzer(stats=stats).solve(loops, paths)
+    return {
+        "paths": [{"path": path["path"], "weight": str(path["weight"])} for path in paths],
+        "loops": [{"loop": loop["loop"], "weight": str(loop["weight"])} for loop in loops],
+        "non_touching_loops": {str(level): groups for level, groups in non_touching_loops.items() if groups},
+        "delta": str(delta),
+        "deltas": [str(path_delta) for path_delta in deltas],
+        "transfer_function": str(result),
+    }
+
+
+def solve_routh(coeffs, stats=None):
+    sign_changes, rhp_roots, characteristic_eqn, _ = RouthStabilitySolver(coeffs, stats=stats, record_steps=False).solve()
+    # Zero sign changes is not enough: roots on the imaginary axis or at the origin are only marginally stable
+    stable = bool(RouthStabilitySolver.screen([coeffs])[1][0])
+    return {
+        "characteristic_equation": characteristic_eqn,
+        "sign_changes": sign_changes,
+        "stable": stable,
+        "rhp_roots": rhp_roots,
+    }
+
+
+def handle_request(payload):
+    response = {"request_id": payload.get("request_id")} if isinstance(payload, dict) else {"request_id": None}
+    try:
+        response.update(_dispatch(payload))
+    except Exception as error:
+        response["error"] = f"{type(error).__name__}: {error}"
+    return response
+
+
+def _dispatch(payload):
+    if not isinstance(payload, dict):
+        raise ValueError("Request must be a JSON object.")
+    stats = SolveStats() if payload.get("stats") else None
+    if "graph" in payload:
+        result = solve_graph(payload["graph"], stats)
+    elif "coeffs" in payload:
+        if len(payload["coeffs"]) < 2:
+            raise ValueError("Routh requests need at least two coefficients.")
+        result = solve_routh(payload["coeffs"], stats)
+    else:
+        raise ValueError("Unsupported request: expected a 'graph' or 'coeffs' field.")
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+    return result
+
+
+def _warm_up(log_level=None, dump_directory=None):
+    # Pays for the SymPy import and first-call caches once per worker process, without logging or dumping them,
+    # then applies the diagnostics settings of the parent (spawned workers start from scratch)
+    logging.disable(logging.CRITICAL)
+    dump_expressions(None)
+    handle_request({"graph": {"R": {"A": "1"}, "A": {"A": "-1", "C": "1"}}})
+    handle_request({"coeffs": [1, 2, 3]})
+    logging.disable(logging.NOTSET)
+
+    if log_level is not None:
+        logging.basicConfig(level=log_level, stream=sys.stderr)
+    dump_expressions(dump_directory)
+
+
+def _parse(line):
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as error:
+        return None, {"request_id": None, "error": f"JSONDecodeError: {error}"}
+
+
+def serve(lines, workers=None, log_level=None, dump_directory=None):
+    # Yields one response per non-blank line, in input order.
+    # workers=0 handles requests in this process, otherwise a warm process pool is kept for the whole stream
+    requests = (_parse(line) for line in lines if line.strip())
+
+    if workers == 0:
+        for payload, failure in requests:
+            yield failure or handle_request(payload)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up, initargs=(log_level, dump_directory)) as executor:
+        window = (workers or os.cpu_count() or 1) * 4  # Bounded read-ahead keeps memory flat on long streams
+        pending = deque()
+        for payload, failure in requests:
+            pending.append(failure if failure else executor.submit(handle_request, payload))
+            if len(pending) >= window:
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+
+
+def _result(item):
+    return item if isinstance(item, dict) else item.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless signal flow graph / Routh stability service (JSON lines).")
+    parser.add_argument("input", nargs="?", help="JSON-lines request file (default: stdin)")
+    parser.add_argument("-o", "--output", help="JSON-lines result file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes, 0 to run inline")
+    parser.add_argument("--log-level", default="WARNING", help="diagnostics level on stderr, e.g. DEBUG")
+    parser.add_argument("--dump-expressions", metavar="DIR", help="write every Δ, numerator and result to DIR")
+    args = parser.parse_args(argv)
+
+    log_level = args.log_level.upper()
+    logging.basicConfig(level=log_level, stream=sys.stderr)
+    if args.dump_expressions:
+        dump_expressions(args.dump_expressions)
+
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    target = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for response in serve(source, args.workers, log_level, args.dump_expressions):
+            target.write(json.dumps(response, ensure_ascii=False) + "\n")
+            target.flush()
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
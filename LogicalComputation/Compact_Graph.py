@@ -0,0 +1,173 @@
+from sympy import sympify
+
+
+class CompactGraph:
+    # Immutable CSR view of a signal flow graph:
+    # the outward edges of node i are targets[offsets[i]:offsets[i + 1]] with the matching weights
+    __slots__ = ('__node_ids', '__index', '__offsets', '__targets', '__weights', '__in_degree')
+
+    def __init__(self, node_ids, edges):
+        # edges: iterable of (source_index, target_index, weight), kept in insertion order per source
+        node_ids = tuple(node_ids)
+        outward = [[] for _ in node_ids]
+        in_degree = [0] * len(node_ids)
+        for source, target, weight in edges:
+            outward[source].append((target, weight))
+            in_degree[target] += 1
+
+        offsets = [0]
+        targets = []
+        weights = []
+        for node_edges in outward:
+            for target, weight in node_edges:
+                targets.append(target)
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        object.__setattr__(self, '_CompactGraph__node_ids', node_ids)
+        object.__setattr__(self, '_CompactGraph__index', {node_id: i for i, node_id in enumerate(node_ids)})
+        object.__setattr__(self, '_CompactGraph__offsets', tuple(offsets))
+        object.__setattr__(self, '_CompactGraph__targets', tuple(targets))
+        object.__setattr__(self, '_CompactGraph__weights', tuple(weights))
+        object.__setattr__(self, '_CompactGraph__in_degree', tuple(in_degree))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactGraph is immutable")
+
+    def __getstate__(self):
+        return self.__node_ids, self.__offsets, self.__targets, self.__weights, self.__in_degree
+
+    def __setstate__(self, state):
+        node_ids, offsets, targets, weights, in_degree = state
+        object.__setattr__(self, '_CompactGraph__node_ids', node_ids)
+        object.__setattr__(self, '_CompactGraph__index', {node_id: i for i, node_id in enumerate(node_ids)})
+        object.__setattr__(self, '_CompactGraph__offsets', offsets)
+        object.__setattr__(self, '_CompactGraph__targets', targets)
+        object.__setattr__(self, '_CompactGraph__weights', weights)
+        object.__setattr__(self, '_CompactGraph__in_degree', in_degree)
+
+    @classmethod
+    def from_canvas(cls, canvas):
+        # Reads Node/Edge items once; nothing from the canvas is referenced afterwards
+        nodes = canvas.adj_list
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [
+            (index[node], index[edge.end_node], sympify(edge.weight))
+            for node in nodes
+            for edge in node.outward_edges
+        ]
+        return cls([node.id for node in nodes], edges)
+
+    @classmethod
+    def from_dict(cls, adjacency):
+        # adjacency: {source_id: {target_id: weight}} or {source_id: [(target_id, weight), ...]}
+        # Nodes are numbered in order of first appearance
+        index = {}
+
+        def node_index(node_id):
+            if node_id not in index:
+                index[node_id] = len(index)
+            return index[node_id]
+
+        edges = []
+        for source, targets in adjacency.items():
+            source_index = node_index(source)
+            pairs = targets.items() if isinstance(targets, dict) else targets
+            for target, weight in pairs:
+                edges.append((source_index, node_index(target), sympify(weight)))
+        return cls(index.keys(), edges)
+
+    @property
+    def node_ids(self):
+        return self.__node_ids
+
+    @property
+    def offsets(self):
+        return self.__offsets
+
+    @property
+    def targets(self):
+        return self.__targets
+
+    @property
+    def weights(self):
+        return self.__weights
+
+    @property
+    def node_count(self):
+        return len(self.__node_ids)
+
+    @property
+    def edge_count(self):
+        return len(self.__targets)
+
+    def index_of(self, node_id):
+        return self.__index[node_id]
+
+    def out_edges(self, node):
+        return range(self.__offsets[node], self.__offsets[node + 1])
+
+    def in_degree(self, node):
+        return self.__in_degree[node]
+
+    def out_degree(self, node):
+        return self.__offsets[node + 1] - self.__offsets[node]
+
+    def mask(self, nodes):
+        # Bitmask with bit i set for every node index i
+        result = 0
+        for node in nodes:
+            result |= 1 << node
+        return result
+
+    def strongly_connected_components(self):
+        # Tarjan's algorithm on an explicit stack; returns the component number of every node.
+        # Components are numbered in the order Tarjan completes them (reverse topological order)
+        offsets, targets = self.__offsets, self.__targets
+        node_count = len(self.__node_ids)
+        index = [-1] * node_count
+        low = [0] * node_count
+        component = [-1] * node_count
+        next_edge = [0] * node_count
+        stack = []
+        counter = 0
+        components_count = 0
+
+        for root in range(node_count):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            next_edge[root] = offsets[root]
+            stack.append(root)
+            call_stack = [root]
+
+            while call_stack:
+                node = call_stack[-1]
+                edge = next_edge[node]
+                if edge < offsets[node + 1]:
+                    next_edge[node] = edge + 1
+                    neighbor = targets[edge]
+                    if index[neighbor] == -1:
+                        index[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        next_edge[neighbor] = offsets[neighbor]
+                        stack.append(neighbor)
+                        call_stack.append(neighbor)
+                    elif component[neighbor] == -1:  # Still on the Tarjan stack
+                        low[node] = min(low[node], index[neighbor])
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        component[member] = components_count
+                        if member == node:
+                            break
+                    components_count += 1
+
+        return component
@@ -0,0 +1,30 @@
+import logging
+import os
+from itertools import count
+
+
+# Diagnostics go through the standard logging tree: every module logs to logging.getLogger(__name__)
+# with %-style arguments, so expressions are only turned into strings when the record is emitted.
+# Configure with logging.basicConfig / logging.getLogger('LogicalComputation').setLevel(logging.DEBUG)
+_dump_directory = None
+_dump_counter = count(1)
+
+
+def dump_expressions(directory):
+    # Writes every expression passed to dump_expression into directory, None stops dumping
+    global _dump_directory
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    _dump_directory = directory
+
+
+def dump_expression(name, expression):
+    # Returns the written path, or None when dumping is off (the expression is never converted then)
+    directory = _dump_directory
+    if directory is None:
+        return None
+    path = os.path.join(directory, f"{next(_dump_counter):05d}_{os.getpid()}_{name}.txt")
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(str(expression))
+    logging.getLogger(__name__).debug("Wrote %s to %s", name, path)
+    return path
@@ -0,0 +1,115 @@
+import numpy as np
+from sympy import sympify, Integer, Symbol, default_sort_key
+from sympy.polys.matrices import DomainMatrix
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Transfer_Function import TransferFunction, compile_expression
+
+
+class LinearSystemSolver:
+    # Transfer function from the node equations instead of loop enumeration.
+    # Every node but the input obeys x_j = Σ w_ij x_i, so (I - A) x = b with b the gains leaving the input:
+    # det(I - A) is Mason's Δ and, by Cramer's rule, replacing the output column with b gives the numerator
+    def __init__(self, canvas):
+        # Accepts a Canvas or a CompactGraph, like the loop and path extractor
+        extractor = solver(canvas)
+        self.__graph = extractor.graph
+        self.__input_node = extractor.input_node
+        self.__output_node = extractor.output_node
+        self.__unknowns = [node for node in range(self.__graph.node_count) if node != self.__input_node]
+        self.__position = {node: i for i, node in enumerate(self.__unknowns)}
+        self.__matrix, self.__rhs = self.__assemble()
+        self.transfer_function = None
+
+    def __assemble(self):
+        # Sparse I - A as {(row, column): gain} and b as {row: gain}, parallel edges summed
+        matrix = {(row, row): Integer(1) for row in range(len(self.__unknowns))}
+        rhs = {}
+        targets, weights = self.__graph.targets, self.__graph.weights
+        for source in range(self.__graph.node_count):
+            for edge in self.__graph.out_edges(source):
+                row = self.__position[targets[edge]]  # The input has no inward edges
+                if source == self.__input_node:
+                    rhs[row] = rhs.get(row, 0) + weights[edge]
+                else:
+                    column = self.__position[source]
+                    matrix[(row, column)] = matrix.get((row, column), 0) - weights[edge]
+        return matrix, rhs
+
+    def __numerator_entries(self, entries):
+        # Cramer's rule: the output column of I - A replaced by b
+        column = self.__position[self.__output_node]
+        replaced = {key: value for key, value in entries.items() if key[1] != column}
+        replaced.update({(row, column): value for row, value in self.__rhs.items()})
+        return replaced
+
+    def __determinant(self, entries):
+        # Fraction-free (Bareiss) elimination over the polynomial ring of the gains, or their fraction field
+        # when a gain has a denominator; python-flint, when installed, takes over through DomainMatrix
+        size = len(self.__unknowns)
+        rows = {}
+        for (row, column), value in entries.items():
+            rows.setdefault(row, {})[column] = value
+        matrix = DomainMatrix.from_dict_sympy(size, size, rows)
+        return matrix.domain.to_sympy(matrix.det())
+
+    def solve(self):
+        # Returns (Δ, transfer function), Δ matching SignalFlowAnalyzer.solve term for term once expanded
+        if self.__input_node == self.__output_node:
+            delta = numerator = Integer(1)
+        else:
+            delta = self.__determinant(self.__matrix)
+            numerator = self.__determinant(self.__numerator_entries(self.__matrix))
+        self.transfer_function = TransferFunction(numerator, delta)
+        return delta, numerator / delta
+
+    def evaluate(self, points):
+        # Numeric Δ and transfer function over a grid, one LU factorisation per point and determinant.
+        # points maps symbols (or their names) to values that broadcast together, e.g. {'s': 1j * omega}
+        variables = [Symbol(name) if isinstance(name, str) else name for name in points]
+        grid = np.broadcast_arrays(*[np.asarray(values, dtype=complex) for values in points.values()])
+        shape = grid[0].shape if grid else ()
+
+        if self.__input_node == self.__output_node:
+            return np.ones(shape, dtype=complex), np.ones(shape, dtype=complex)
+
+        size = len(self.__unknowns)
+        matrix = np.zeros(shape + (size, size), dtype=complex)
+        for (row, column), value in self.__matrix.items():
+            matrix[..., row, column] = self.__evaluate_gain(value, variables, grid, shape)
+
+        column = self.__position[self.__output_node]
+        numerator_matrix = matrix.copy()
+        numerator_matrix[..., :, column] = 0
+        for row, value in self.__rhs.items():
+            numerator_matrix[..., row, column] = self.__evaluate_gain(value, variables, grid, shape)
+
+        delta = np.linalg.det(matrix)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.linalg.det(numerator_matrix) / delta
+        return delta, result
+
+    def cross_check(self, expression, samples=4, tolerance=1e-8, seed=0):
+        # Compares a transfer function (e.g. the Mason result) with this engine at random complex points
+        expression = sympify(expression)
+        symbols = set(expression.free_symbols)
+        for value in list(self.__matrix.values()) + list(self.__rhs.values()):
+            symbols |= sympify(value).free_symbols
+        variables = sorted(symbols, key=default_sort_key)
+
+        generator = np.random.default_rng(seed)
+        points = {
+            variable: generator.uniform(0.5, 1.5, samples) * np.exp(1j * generator.uniform(-1, 1, samples))
+            for variable in variables
+        }
+        _, expected = self.evaluate(points)
+        given = compile_expression(expression, tuple(variables))(*points.values())
+        given = np.broadcast_to(np.asarray(given, dtype=complex), expected.shape)
+        return bool(np.allclose(given, expected, rtol=tolerance, atol=tolerance))
+
+    def __evaluate_gain(self, weight, variables, grid, shape):
+        expression = sympify(weight)
+        missing = expression.free_symbols - set(variables)
+        if missing:
+            raise ValueError(f"No values given for {', '.join(sorted(map(str, missing)))}.")
+        function = compile_expression(expression, tuple(variables))
+        return np.broadcast_to(np.asarray(function(*grid), dtype=complex), shape)
@@ -1,115 +1,305 @@
-from sympy import sympify, simplify, Mul
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from sympy import Mul
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Solve_Stats import NullStats
+
+
+# Process pool entry points, each worker rebuilds a solver around the (picklable) graph
+def _search_paths(graph, first_edges):
+    return solver(graph).search_paths(first_edges)
+
+def _search_loops(graph, start_nodes):
+    return solver(graph).search_loops(start_nodes)
+
 
 class solver:
-    def __init__(self, canvas):
-        self.__canvas = canvas
-        self.__node_list = canvas.adj_list
+    def __init__(self, canvas, stats=None):
+        # Accepts a Canvas (or anything with an adj_list of nodes) or an already built CompactGraph
+        # stats: optional SolveStats collecting the time and record counts of every stage
+        self.__stats = stats if stats is not None else NullStats()
+        with self.__stats.stage('graph'):
+            self.__graph = canvas if isinstance(canvas, CompactGraph) else CompactGraph.from_canvas(canvas)
         self.__paths = []  # To store all paths from input to output
         self.__loops = []  # To store all loops
+        self.truncated = False  # Set when a bounded iter_paths / iter_loops search was cut short
         self.__input_node = self.__find_input_node()
         self.__output_node = self.__find_output_node()
 
+    @property
+    def graph(self):
+        return self.__graph
+
+    @property
+    def input_node(self):
+        return self.__input_node
+
+    @property
+    def output_node(self):
+        return self.__output_node
+
     def __find_input_node(self):
         # Find the node with no inward edges
-        for node in self.__node_list:
-            if not node.inward_edges:
+        for node in range(self.__graph.node_count):
+            if self.__graph.in_degree(node) == 0:
                 return node
         raise ValueError("No input node found (node with no inward edges).")
 
     def __find_output_node(self):
         # Find the node with no outward edges
-        for node in self.__node_list:
-            if not node.outward_edges:
+        for node in range(self.__graph.node_count):
+            if self.__graph.out_degree(node) == 0:
                 return node
         raise ValueError("No output node found (node with no outward edges).")
 
-    def __dfs(self, current_node, path, incoming_weight):
-        path.append((current_node, incoming_weight))  # Store node with weight of incoming edge
-
-        if current_node == self.__output_node:  # End node
-            self.__paths.append(path.copy())
-        else:
-            for edge in current_node.outward_edges:
-                neighbor = edge.end_node
-                if all(n != neighbor for n, _ in path):  # Avoid cycles in path
-                    self.__dfs(neighbor, path, edge.weight)
-
-        path.pop()  # Backtrack
-
-    def extract_paths_and_loops(self):
-        for node in self.__node_list:
-            if node == self.__input_node:  # Input node
-                self.__dfs(node, [], 1)
-        self.__detect_loops()
-
-    def __detect_loops(self):
-        for node in self.__node_list:
-            self.__find_loops(node, [])
-
-    def __find_loops(self, current_node, path):
-        for edge in current_node.outward_edges:
-            neighbor = edge.end_node
-            index = next((i for i, (n, _) in enumerate(path) if n == neighbor), -1)
-            if index != -1:
-                loop_path = path[index:] + [(neighbor, edge.weight)]
-                if not self.__is_duplicate_loop(loop_path):
-                    self.__loops.append(loop_path)
-            else:
-                path.append((neighbor, edge.weight))
-                self.__find_loops(neighbor, path)
-                path.pop()
+    def extract_paths_and_loops(self, workers=None):
+        # workers > 1 spreads the search over a process pool: paths by first edge out of the input node,
+        # loops by their lowest indexed node. Results are merged back into the serial order
+        if workers is None or workers <= 1:
+            with self.__stats.stage('paths'):
+                self.__paths = self.search_paths()
+            with self.__stats.stage('loops'):
+                self.__loops = self.search_loops()
+            self.__count_records()
+            return
+
+        first_edges = [[edge] for edge in self.__graph.out_edges(self.__input_node)]
+        shards = [list(range(self.__graph.node_count))[i::workers * 4] for i in range(workers * 4)]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths_parts = executor.map(_search_paths, repeat(self.__graph), first_edges)
+            loops_parts = executor.map(_search_loops, repeat(self.__graph), shards)
+            with self.__stats.stage('paths'):
+                self.__paths = [record for part in paths_parts for record in part]
+            with self.__stats.stage('loops'):
+                loops = [record for part in loops_parts for record in part]
+
+                # Each shard keeps the discovery order of its start nodes, so a stable sort restores the serial order
+                self.__loops = sorted(loops, key=lambda record: record[0][0])
+        self.__count_records()
+
+    def __count_records(self):
+        self.__stats.count('nodes', self.__graph.node_count)
+        self.__stats.count('edges', self.__graph.edge_count)
+        self.__stats.count('paths', len(self.__paths))
+        self.__stats.count('loops', len(self.__loops))
+
+    def search_paths(self, first_edges=None):
+        return list(self.iter_paths(first_edges=first_edges))
+
+    def search_loops(self, start_nodes=None):
+        return list(self.iter_loops(start_nodes=start_nodes))
 
+    def iter_paths(self, max_count=None, max_length=None, timeout=None, first_edges=None):
+        # Yields forward path records (node indices, gain, node bitmask) as they are found, see graph.node_ids for the ids.
+        # Bounds: max_count records, max_length edges per path, timeout seconds; truncated tells if one cut the search.
+        # first_edges restricts the search to paths leaving the input node through those edges.
+        # Iterative DFS over preallocated per-depth buffers; a path is only copied when it reaches the output
+        self.truncated = False
+        input_node, output_node = self.__input_node, self.__output_node
+        if input_node == output_node:
+            yield self.__make_record([input_node], [1])
+            return
 
+        offsets, targets, weights = self.__graph.offsets, self.__graph.targets, self.__graph.weights
+        node_count = self.__graph.node_count
+        max_count, max_length = self.__bounds(max_count, max_length)
+        out_of_time = self.__deadline(timeout)
+        count = 0
+        nodes = [0] * node_count             # Node at each depth of the current path
+        incoming = [None] * node_count       # Weight of the edge entering that node
+        next_edge = [0] * node_count         # Next outward edge to try at each depth
+        on_path = bytearray(node_count)
 
-    def __is_duplicate_loop(self, new_loop):
-        def normalize_loop_ids(ids):
-            if ids[0] == ids[-1]:
-                ids = ids[:-1]
-            n = len(ids)
-            return min([tuple(ids[i:] + ids[:i]) for i in range(n)])
+        nodes[0], incoming[0] = input_node, 1
+        on_path[input_node] = 1
 
-        new_ids = [node.id for node, _ in new_loop]
-        norm_new_ids = normalize_loop_ids(new_ids)
-        new_weight = self.__calculate_path_weight(new_loop, is_loop=True)
+        if first_edges is None:
+            first_edges = self.__graph.out_edges(input_node)
+        for first_edge in first_edges:
+            neighbor = targets[first_edge]
+            if on_path[neighbor]:
+                continue
+            if max_length < 1:
+                self.truncated = True
+                continue
+            depth = 1
+            nodes[1], incoming[1], next_edge[1] = neighbor, weights[first_edge], offsets[neighbor]
+            on_path[neighbor] = 1
 
-        for loop in self.__loops:
-            existing_ids = [node.id for node, _ in loop]
-            norm_existing_ids = normalize_loop_ids(existing_ids)
-            if norm_new_ids == norm_existing_ids:
-                existing_weight = self.__calculate_path_weight(loop, is_loop=True)
-                if new_weight.equals(existing_weight):
-                    return True
+            while depth:
+                if out_of_time():
+                    self.truncated = True
+                    return
+                current_node = nodes[depth]
+                edge = next_edge[depth]
+                if current_node == output_node:  # End node
+                    if count == max_count:
+                        self.truncated = True
+                        return
+                    count += 1
+                    yield self.__make_record(nodes[:depth + 1], incoming[:depth + 1])
+                elif edge < offsets[current_node + 1]:
+                    next_edge[depth] = edge + 1
+                    neighbor = targets[edge]
+                    if on_path[neighbor]:  # Avoid cycles in path
+                        continue
+                    if depth >= max_length:
+                        self.truncated = True
+                        continue
+                    depth += 1
+                    nodes[depth], incoming[depth], next_edge[depth] = neighbor, weights[edge], offsets[neighbor]
+                    on_path[neighbor] = 1
+                    continue
 
-        return False
+                on_path[current_node] = 0  # Backtrack
+                depth -= 1
 
+    def iter_loops(self, max_count=None, max_length=None, timeout=None, start_nodes=None):
+        # Yields loop records (node indices with the start repeated at the end, gain, node bitmask) as they are found.
+        # Same bounds as iter_paths, max_length counting the edges around the loop.
+        # Johnson's algorithm: every elementary cycle is reported once, from its lowest indexed node.
+        # start_nodes restricts the search to the loops whose lowest indexed node is listed
+        self.truncated = False
+        node_count = self.__graph.node_count
+        max_count, max_length = self.__bounds(max_count, max_length)
+        out_of_time = self.__deadline(timeout)
+        count = 0
+        # A loop never leaves its strongly connected component, so edges between components are dropped
+        # and nodes left without successors (acyclic regions) are never searched from
+        with self.__stats.stage('loops.components'):
+            component = self.__graph.strongly_connected_components()
+        with self.__stats.stage('loops.merge_parallel_edges'):
+            successors = [self.__merge_parallel_edges(node, component) for node in range(node_count)]
+        successors_nodes = [list(node_successors) for node_successors in successors]
+        successors_weights = [list(node_successors.values()) for node_successors in successors]
+
+        # Explicit stack: node, weight of the edge entering it, next successor to try and
+        # whether a loop was closed below it (the return value of the recursive formulation)
+        nodes = [0] * node_count
+        incoming = [None] * node_count
+        next_successor = [0] * node_count
+        found_loop = [False] * node_count
+
+        if start_nodes is None:
+            start_nodes = range(node_count)
+        for start_node in start_nodes:
+            if not successors_nodes[start_node]:
+                continue
+            blocked = bytearray(node_count)
+            blocked_map = {}
+
+            depth = 0
+            nodes[0], incoming[0], next_successor[0], found_loop[0] = start_node, 1, 0, False
+            blocked[start_node] = 1
+
+            while depth >= 0:
+                if out_of_time():
+                    self.truncated = True
+                    return
+                current_node = nodes[depth]
+                position = next_successor[depth]
+                neighbors = successors_nodes[current_node]
+
+                if position < len(neighbors):
+                    next_successor[depth] = position + 1
+                    neighbor = neighbors[position]
+                    if neighbor < start_node:  # Loops through lower nodes were already found
+                        continue
+                    weight = successors_weights[current_node][position]
+                    if neighbor == start_node:
+                        if depth + 1 > max_length:
+                            self.truncated = True
+                            found_loop[depth] = True
+                            continue
+                        if count == max_count:
+                            self.truncated = True
+                            return
+                        count += 1
+                        yield self.__make_record(nodes[:depth + 1] + [neighbor], incoming[:depth + 1] + [weight])
+                        found_loop[depth] = True
+                    elif not blocked[neighbor]:
+                        if depth + 2 > max_length:
+                            # A cut branch may still hold loops, so it must not leave nodes blocked
+                            self.truncated = True
+                            found_loop[depth] = True
+                            continue
+                        depth += 1
+                        nodes[depth], incoming[depth], next_successor[depth], found_loop[depth] = neighbor, weight, 0, False
+                        blocked[neighbor] = 1
+                    continue
+
+                if found_loop[depth]:
+                    self.__unblock(current_node, blocked, blocked_map)
+                    if depth:
+                        found_loop[depth - 1] = True
+                else:
+                    # Stay blocked until one of the successors gets unblocked
+                    for neighbor in neighbors:
+                        if neighbor >= start_node:
+                            blocked_map.setdefault(neighbor, set()).add(current_node)
+                depth -= 1
+
+    @staticmethod
+    def __bounds(max_count, max_length):
+        # -1 and infinity are never reached, so unbounded searches skip the None checks
+        return (-1 if max_count is None else max_count), (float('inf') if max_length is None else max_length)
+
+    @staticmethod
+    def __deadline(timeout, check_every=1024):
+        # Returns a cheap callable that reads the clock only once every check_every steps
+        if timeout is None:
+            return lambda: False
+        deadline = time.monotonic() + timeout
+        steps = 0
+
+        def out_of_time():
+            nonlocal steps
+            steps += 1
+            return steps % check_every == 0 and time.monotonic() > deadline
+
+        return out_of_time
+
+    def __merge_parallel_edges(self, node, component):
+        # Loops through parallel edges share their nodes, so one loop with the summed gain replaces them
+        successors = {}
+        targets, weights = self.__graph.targets, self.__graph.weights
+        for edge in self.__graph.out_edges(node):
+            neighbor = targets[edge]
+            if component[neighbor] != component[node]:
+                continue
+            if neighbor in successors:
+                successors[neighbor] = successors[neighbor] + weights[edge]
+            else:
+                successors[neighbor] = weights[edge]
+        return successors
+
+    def __unblock(self, node, blocked, blocked_map):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            blocked[node] = 0
+            for blocked_node in blocked_map.pop(node, ()):
+                if blocked[blocked_node]:
+                    pending.append(blocked_node)
+
+    def __make_record(self, nodes, weights):
+        # (node indices, gain, node bitmask), the gain being the plain product of the edge weights
+        # Paths and loops both start with a unit incoming weight, so it never changes the gain
+        nodes = tuple(nodes)
+        return nodes, Mul(*weights), self.__graph.mask(nodes)
 
     @property
     def paths(self):
         return [
-            {"path": [node.id for node, _ in path], "weight": self.__calculate_path_weight(path)}
-            for path in self.__paths
+            {"path": [self.__graph.node_ids[node] for node in nodes], "weight": weight, "mask": mask}
+            for nodes, weight, mask in self.__paths
         ]
 
     @property
     def loops(self):
         return [
-            {
-                "loop": [node.id for node, _ in loop],
-                "weight": self.__calculate_path_weight(loop, is_loop=True)
-            }
-            for loop in self.__loops
+            {"loop": [self.__graph.node_ids[node] for node in nodes], "weight": weight, "mask": mask}
+            for nodes, weight, mask in self.__loops
         ]
-
-    def __calculate_path_weight(self, path, is_loop=False):
-        weights = []
-
-        if is_loop:
-            for i in range(1, len(path)):
-                _, edge_weight = path[i]
-                weights.append(edge_weight)
-        else:
-            for _, edge_weight in path:
-                weights.append(edge_weight)
-
-        # Use symbolic multiplication
-        return simplify(Mul(*[sympify(w) for w in weights], evaluate=False))
\ No newline at end of file
@@ -1,115 +1,284 @@
-from sympy import sympify, simplify, Mul, Integer
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+from sympy import sympify, simplify, Add, Mul, Integer, Symbol
+from LogicalComputation.Transfer_Function import TransferFunction, compile_expression
+from LogicalComputation.Solve_Stats import NullStats
+from LogicalComputation.Diagnostics import dump_expression
+
+
+logger = logging.getLogger(__name__)
+
+
+# Process pool entry points for SignalFlowAnalyzer(workers=N)
+def _partial_delta_sums(loops_weights, paths_masks, combinations):
+    # Partial Δ and Δk sums over one shard of (combination, mask, sign) entries
+    delta_terms = []
+    paths_terms = [[] for _ in paths_masks]
+    for combination, combination_mask, sign in combinations:
+        term = sign * Mul(*[loops_weights[i] for i in combination])
+        delta_terms.append(term)
+        for path_terms, path_mask in zip(paths_terms, paths_masks):
+            if not combination_mask & path_mask:
+                path_terms.append(term)
+    return Add(*delta_terms), [Add(*path_terms) for path_terms in paths_terms]
+
+def _partial_numerator(deltas_and_gains):
+    return Add(*[path_delta * path_gain for path_delta, path_gain in deltas_and_gains])
+
 
 class SignalFlowAnalyzer:
-    def __init__(self):
+    def __init__(self, simplify_result=False, workers=None, factor_components=False, stats=None):
+        # Gains are kept as plain products; simplify_result runs one simplify() on the final transfer function
+        # workers > 1 shards the Δ / Δk / numerator sums over a process pool
+        # factor_components splits the loops into groups that touch each other (transitively): loops of different
+        # groups never touch, so Δ and every Δk are products of per-group factors, and only combinations
+        # inside a group are enumerated (and reported in the non-touching loops)
+        # stats: optional SolveStats collecting the time of every stage and the combination counts
+        self.__stats = stats if stats is not None else NullStats()
+        self.__simplify_result = simplify_result
+        self.__workers = workers
+        self.__factor_components = factor_components
         self.__untouching_loops = {}
-        self.__untouching_loops_paths = {}
         self.paths_gain = {}
         self.loops_gain = {}
         self.untouching_loops_number = 0
+        self.transfer_function = None
 
-    def __filter(self, loops, paths):
-        loops_sets = []
-        paths_sets = []
+    def __node_masks(self, loops, paths):
+        # Node sets as bitmasks; records built by the extractor already carry them
+        if all('mask' in loop for loop in loops) and all('mask' in path for path in paths):
+            return [loop['mask'] for loop in loops], [path['mask'] for path in paths]
 
-        self.paths_gain = {idx: path['weight'] for idx, path in enumerate(paths)}
-        self.loops_gain = {tuple(loop['loop']): loop['weight'] for loop in loops}
+        bits = {}
 
-        for loop_description in loops:
-            loops_sets.append(set(loop_description['loop']))
+        def mask_of(nodes):
+            mask = 0
+            for node in nodes:
+                mask |= 1 << bits.setdefault(node, len(bits))
+            return mask
 
-        for idx, path_description in enumerate(paths):
-            path_nodes = path_description['path']
-            paths_sets.append(set(path_nodes))
+        return [mask_of(loop['loop']) for loop in loops], [mask_of(path['path']) for path in paths]
 
-            self.__untouching_loops_paths[idx] = {}
-            self.__untouching_loops_paths[idx][0] = [
-                [loop['loop']] for loop in loops if set(loop['loop']).isdisjoint(set(path_nodes))
-            ]
+    def __filter(self, loops, paths):
+        self.paths_gain = {idx: path['weight'] for idx, path in enumerate(paths)}
+        self.loops_gain = {tuple(loop['loop']): loop['weight'] for loop in loops}
 
-        self.__untouching_loops[0] = [[loop['loop']] for loop in loops]
+        loops_masks, paths_masks = self.__node_masks(loops, paths)
 
-        loops_number = 1
+        # Loop compatibility graph: bit j of compatible[i] is set when loops i < j don't touch
+        compatible = [0] * len(loops)
+        group = list(range(len(loops)))  # Union-find over touching loops
+        for i in range(len(loops)):
+            for j in range(i + 1, len(loops)):
+                if not loops_masks[i] & loops_masks[j]:
+                    compatible[i] |= 1 << j
+                elif self.__factor_components:
+                    group[self.__find_group(group, j)] = self.__find_group(group, i)
 
-        while True:
-            self.__untouching_loops[loops_number] = []
-            current_level = self.__untouching_loops[loops_number - 1]
+        # Loop indices of every group as a bitmask, a single group holding every loop unless factoring
+        if self.__factor_components and loops:
+            groups = {}
+            for i in range(len(loops)):
+                root = self.__find_group(group, i)
+                groups[root] = groups.get(root, 0) | 1 << i
+            groups_members = list(groups.values())
+        else:
+            groups_members = [(1 << len(loops)) - 1]
 
-            for i in range(len(self.__untouching_loops[0])):
-                for j in range(i + 1, len(current_level)):
-                    loop_a = self.__untouching_loops[0][i]
-                    loop_b = current_level[j]
+        # Every clique of the compatibility graph is a non-touching combination,
+        # built in increasing loop index order so each one is generated exactly once
+        self.__groups_combinations = []
+        for members in groups_members:
+            self.__combinations = {0: []}
+            remaining = members
+            while remaining:
+                lowest = remaining & -remaining
+                remaining ^= lowest
+                i = lowest.bit_length() - 1
+                self.__extend_combination((i,), loops_masks[i], compatible[i] & members, loops_masks, compatible)
+            self.__groups_combinations.append(self.__combinations)
 
-                    loop_a_union = set().union(*loop_a)
-                    loop_b_union = set().union(*loop_b)
+        max_level = max(len(combinations) for combinations in self.__groups_combinations) if loops else 1
+        self.untouching_loops_number = max_level
 
-                    if loop_a_union.isdisjoint(loop_b_union):
-                        combined = loop_a + loop_b
-                        if combined not in self.__untouching_loops[loops_number]:
-                            self.__untouching_loops[loops_number].append(combined)
+        # Keeps the trailing empty level callers expect
+        self.__untouching_loops = {
+            level: [
+                [loops[i]['loop'] for i in combination]
+                for combinations in self.__groups_combinations
+                for combination, _ in combinations.get(level, [])
+            ]
+            for level in range(max_level + 1)
+        }
 
-            if not self.__untouching_loops[loops_number]:
-                break
+        self.__loops_weights = [loop['weight'] for loop in loops]
+        self.__paths_masks = paths_masks
 
-            loops_number += 1
+    @staticmethod
+    def __find_group(group, i):
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
 
-        max_level = loops_number  # Avoids accessing the last empty level
-        self.untouching_loops_number = max_level
+    def __extend_combination(self, combination, combination_mask, candidates, loops_masks, compatible):
+        self.__combinations.setdefault(len(combination) - 1, []).append((combination, combination_mask))
 
-        for idx, path_description in enumerate(paths):
-            path_set = set(path_description['path'])
-            for level in range(1, max_level):
-                self.__untouching_loops_paths[idx][level] = []
-                for loop_combo in self.__untouching_loops[level]:
-                    loop_union = set().union(*loop_combo)
-                    if path_set.isdisjoint(loop_union):
-                        self.__untouching_loops_paths[idx][level].append(loop_combo)
+        while candidates:
+            lowest = candidates & -candidates
+            candidates ^= lowest
+            loop = lowest.bit_length() - 1
+            self.__extend_combination(
+                combination + (loop,),
+                combination_mask | loops_masks[loop],
+                candidates & compatible[loop],
+                loops_masks,
+                compatible
+            )
 
-    def __calculate_delta(self):
-        delta = Integer(1)
+    def __signed_combinations(self, combinations):
+        # (combination, mask, sign) for every combination of one group, the sign alternating with the level
         sign = -1
-        for loops_keys in self.__untouching_loops:
-            all_loops = self.__untouching_loops[loops_keys]
-            summation = Integer(0)
-            for non_touching_loops in all_loops:
-                multiplication_of_loops = Integer(1)
-                for loop in non_touching_loops:
-                    loop_gain = self.loops_gain[tuple(loop)]
-                    multiplication_of_loops *= loop_gain
-                summation += multiplication_of_loops
-            delta += sign * summation
+        for level in range(len(combinations)):
+            for combination, combination_mask in combinations[level]:
+                yield combination, combination_mask, sign
             sign *= -1
-        return delta
+
+    def __calculate_delta(self):
+        # Signed gain product of every non-touching combination, computed once and shared with every Δk
+        self.__delta_terms = [
+            [
+                (combination_mask, sign * Mul(*[self.__loops_weights[i] for i in combination]))
+                for combination, combination_mask, sign in self.__signed_combinations(combinations)
+            ]
+            for combinations in self.__groups_combinations
+        ]
+        return Mul(*[Add(Integer(1), *[term for _, term in group_terms]) for group_terms in self.__delta_terms])
 
     def __calculate_sigma_paths_mul_delta(self):
+        # Δk is Δ restricted to the combinations that don't touch path k
         numerator_summation = 0
         deltas = []
-        for path_idx in self.__untouching_loops_paths:
-            loops_info = self.__untouching_loops_paths[path_idx]
-            delta = Integer(1)
-            sign = -1
-            for loops_keys in loops_info:
-                all_loops = loops_info[loops_keys]
-                summation = Integer(0)
-                for non_touching_loops in all_loops:
-                    multiplication_of_loops = Integer(1)
-                    for loop in non_touching_loops:
-                        loop_gain = self.loops_gain[tuple(loop)]
-                        multiplication_of_loops *= loop_gain
-                    summation += multiplication_of_loops
-                delta += sign * summation
-                sign *= -1
+        for path_idx, path_mask in enumerate(self.__paths_masks):
+            delta = Mul(*[
+                Add(Integer(1), *[term for combination_mask, term in group_terms if not combination_mask & path_mask])
+                for group_terms in self.__delta_terms
+            ])
             deltas.append(delta)
             numerator_summation += delta * self.paths_gain[path_idx]
 
         return numerator_summation, deltas
 
+    def __calculate_in_parallel(self):
+        # Same sums as __calculate_delta / __calculate_sigma_paths_mul_delta, added up from per-shard partial sums
+        shards_count = self.__workers * 4
+        paths = list(range(len(self.__paths_masks)))
+        delta_factors = []
+        paths_factors = [[] for _ in paths]
+
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            for combinations in self.__groups_combinations:
+                combinations = list(self.__signed_combinations(combinations))
+                partial_sums = list(executor.map(
+                    _partial_delta_sums,
+                    repeat(self.__loops_weights),
+                    repeat(self.__paths_masks),
+                    [combinations[i::shards_count] for i in range(shards_count)]
+                ))
+                delta_factors.append(Add(Integer(1), *[delta_part for delta_part, _ in partial_sums]))
+                for idx in paths:
+                    paths_factors[idx].append(Add(Integer(1), *[paths_parts[idx] for _, paths_parts in partial_sums]))
+            delta = Mul(*delta_factors)
+            deltas = [Mul(*path_factors) for path_factors in paths_factors]
+
+            numerator_parts = executor.map(
+                _partial_numerator,
+                [[(deltas[idx], self.paths_gain[idx]) for idx in paths[i::shards_count]] for i in range(shards_count)]
+            )
+            numerator = Add(*numerator_parts)
+
+        return delta, numerator, deltas
+
     def solve(self, loops, paths):
-        self.__filter(loops, paths)
-        delta = self.__calculate_delta()
-        numerator, deltas = self.__calculate_sigma_paths_mul_delta()
-        print("num: " + str(numerator))
-        print("delta: " + str(delta))
-        result = numerator / delta
-        print("result: " + str(result))
+        with self.__stats.stage('non_touching'):
+            self.__filter(loops, paths)
+        self.__count_combinations()
+        if self.__workers is not None and self.__workers > 1:
+            with self.__stats.stage('delta_and_path_deltas'):
+                delta, numerator, deltas = self.__calculate_in_parallel()
+        else:
+            with self.__stats.stage('delta'):
+                delta = self.__calculate_delta()
+            with self.__stats.stage('path_deltas'):
+                numerator, deltas = self.__calculate_sigma_paths_mul_delta()
+        logger.debug("num: %s", numerator)
+        logger.debug("delta: %s", delta)
+        with self.__stats.stage('division'):
+            result = numerator / delta
+            if self.__simplify_result:
+                result = simplify(result)
+            self.transfer_function = TransferFunction(numerator, delta)
+        logger.debug("result: %s", result)
+        dump_expression('numerator', numerator)
+        dump_expression('delta', delta)
+        dump_expression('result', result)
         return delta, deltas, self.__untouching_loops, result
+
+    def evaluate(self, loops, paths, points):
+        # Numeric counterpart of solve: Δ, every Δk and the transfer function as complex arrays over a grid
+        # points maps symbols (or their names) to values that broadcast together, e.g. {'s': 1j * omega}
+        with self.__stats.stage('non_touching'):
+            self.__filter(loops, paths)
+        self.__count_combinations()
+        with self.__stats.stage('evaluate'):
+            return self.__evaluate_grid(loops, paths, points)
+
+    def __count_combinations(self):
+        self.__stats.count('loop_groups', len(self.__groups_combinations))
+        self.__stats.count('combinations', sum(
+            len(level) for combinations in self.__groups_combinations for level in combinations.values()
+        ))
+
+    def __evaluate_grid(self, loops, paths, points):
+
+        variables = [Symbol(name) if isinstance(name, str) else name for name in points]
+        grid = np.broadcast_arrays(*[np.asarray(values, dtype=complex) for values in points.values()])
+        shape = grid[0].shape if grid else ()
+
+        loops_values = [self.__evaluate_gain(loop['weight'], variables, grid, shape) for loop in loops]
+        paths_values = [self.__evaluate_gain(path['weight'], variables, grid, shape) for path in paths]
+
+        delta = np.ones(shape, dtype=complex)
+        deltas = [np.ones(shape, dtype=complex) for _ in paths]
+        for combinations in self.__groups_combinations:
+            group_delta = np.ones(shape, dtype=complex)
+            group_deltas = [np.ones(shape, dtype=complex) for _ in paths]
+            for combination, combination_mask, sign in self.__signed_combinations(combinations):
+                product = sign * loops_values[combination[0]]
+                for i in combination[1:]:
+                    product *= loops_values[i]
+                group_delta += product
+                for path_delta, path_mask in zip(group_deltas, self.__paths_masks):
+                    if not combination_mask & path_mask:
+                        path_delta += product
+            delta *= group_delta
+            for path_delta, group_path_delta in zip(deltas, group_deltas):
+                path_delta *= group_path_delta
+
+        numerator = np.zeros(shape, dtype=complex)
+        for path_delta, path_value in zip(deltas, paths_values):
+            numerator += path_delta * path_value
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = numerator / delta
+        return delta, deltas, result
+
+    def __evaluate_gain(self, weight, variables, grid, shape):
+        expression = sympify(weight)
+        missing = expression.free_symbols - set(variables)
+        if missing:
+            raise ValueError(f"No values given for {', '.join(sorted(map(str, missing)))}.")
+        function = compile_expression(expression, tuple(variables))
+        return np.broadcast_to(np.asarray(function(*grid), dtype=complex), shape)
@@ -0,0 +1,82 @@
+import cProfile
+import io
+import pstats
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+
+class SolveStats:
+    # Opt-in instrumentation: pass one to solver / SignalFlowAnalyzer / RouthStabilitySolver and read it afterwards.
+    # Stage times are wall times and inclusive, so a stage nested in another one is part of both.
+    # profiler: True for cProfile, or any profiler object with enable()/disable() or start()/stop() (pyinstrument);
+    # it only runs inside stages, so the report covers the solvers and nothing around them
+    def __init__(self, profiler=None):
+        self.__stages = {}  # name -> [total seconds, calls]
+        self.__counts = {}
+        self.__profiler = cProfile.Profile() if profiler is True else profiler
+        self.__depth = 0
+
+    @contextmanager
+    def stage(self, name):
+        if self.__depth == 0 and self.__profiler is not None:
+            self.__switch_profiler(True)
+        self.__depth += 1
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.__depth -= 1
+            if self.__depth == 0 and self.__profiler is not None:
+                self.__switch_profiler(False)
+            totals = self.__stages.setdefault(name, [0.0, 0])
+            totals[0] += elapsed
+            totals[1] += 1
+
+    def __switch_profiler(self, on):
+        if hasattr(self.__profiler, 'enable'):
+            (self.__profiler.enable if on else self.__profiler.disable)()
+        else:
+            (self.__profiler.start if on else self.__profiler.stop)()
+
+    def count(self, name, amount=1):
+        self.__counts[name] = self.__counts.get(name, 0) + amount
+
+    @property
+    def stages(self):
+        return {name: {'time': total, 'calls': calls} for name, (total, calls) in self.__stages.items()}
+
+    @property
+    def counts(self):
+        return dict(self.__counts)
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    def as_dict(self):
+        return {'stages': self.stages, 'counts': self.counts}
+
+    def report(self, profile_lines=20):
+        lines = [f"{'stage':32s} {'time (ms)':>12s} {'calls':>8s}"]
+        for name, (total, calls) in self.__stages.items():
+            lines.append(f"{name:32s} {total * 1e3:12.3f} {calls:8d}")
+        if self.__counts:
+            lines.append("")
+            lines.extend(f"{name:32s} {value:12d}" for name, value in self.__counts.items())
+        if isinstance(self.__profiler, cProfile.Profile):
+            output = io.StringIO()
+            pstats.Stats(self.__profiler, stream=output).sort_stats('cumulative').print_stats(profile_lines)
+            lines.extend(["", output.getvalue()])
+        return "\n".join(lines)
+
+
+class NullStats:
+    # Stand-in used when no stats were asked for, every call is a no-op
+    __context = nullcontext()
+
+    def stage(self, name):
+        return NullStats.__context
+
+    def count(self, name, amount=1):
+        pass
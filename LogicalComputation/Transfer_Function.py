@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+import numpy as np
+from sympy import lambdify, sympify, Symbol, default_sort_key
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression, variables):
+    # SymPy hashes expressions structurally, so equal expressions share one compiled function
+    return lambdify(variables, expression, 'numpy', cse=True)
+
+
+class TransferFunction:
+    # numerator / delta from Mason's formula, compiled to NumPy on first numeric use
+    def __init__(self, numerator, delta):
+        self.__numerator = sympify(numerator)
+        self.__delta = sympify(delta)
+        self.__variables = tuple(sorted(
+            self.__numerator.free_symbols | self.__delta.free_symbols, key=default_sort_key
+        ))
+
+    @property
+    def numerator(self):
+        return self.__numerator
+
+    @property
+    def delta(self):
+        return self.__delta
+
+    @property
+    def expression(self):
+        return self.__numerator / self.__delta
+
+    @property
+    def variables(self):
+        return self.__variables
+
+    def __call__(self, values=None, **kwargs):
+        # Values may be scalars or arrays that broadcast together, e.g. tf(s=1j * omega, G1=gains[:, None])
+        values = {**(values or {}), **kwargs}
+        given = {Symbol(name) if isinstance(name, str) else name: value for name, value in values.items()}
+
+        missing = [str(variable) for variable in self.__variables if variable not in given]
+        if missing:
+            raise ValueError(f"No values given for {', '.join(missing)}.")
+
+        arguments = [np.asarray(given[variable]) for variable in self.__variables]
+        numerator = compile_expression(self.__numerator, self.__variables)(*arguments)
+        delta = compile_expression(self.__delta, self.__variables)(*arguments)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.true_divide(numerator, delta)
+
+    def __repr__(self):
+        return f"TransferFunction({self.expression})"
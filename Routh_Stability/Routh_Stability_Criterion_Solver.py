@@ -1,5 +1,14 @@
+import logging
+import numpy as np
 import sympy as sp
 import copy
+import numbers
+from fractions import Fraction
+from LogicalComputation.Solve_Stats import NullStats
+from Routh_Stability.Routh_Steps import RouthStepLog
+
+
+logger = logging.getLogger(__name__)
 
 
 class RouthStabilitySolver():
@@ -24,15 +33,47 @@ class RouthStabilitySolver():
     def to_superscript(num):
         return ''.join(RouthStabilitySolver.__superscript_map[d] for d in str(num))
 
-    def __init__(self, coeffs = []):
+    def __init__(self, coeffs = [], symbolic_roots = False, stats = None, record_steps = True):
+        # symbolic_roots: use sp.solve for the RHP roots instead of the companion matrix eigenvalues
+        # stats: optional SolveStats timing the table fill, the ε limit handling and the root extraction
+        # record_steps: False skips the step log (and every step formula) for batch stability checks, steps is None then
+        self.__stats = stats if stats is not None else NullStats()
+        self.__symbolic_roots = symbolic_roots
+        self.__record_steps = record_steps
         self.__coeffs = coeffs
         self.__order = len(coeffs) - 1
-        self.__steps = []
+        self.__step_log = None
         self.__routh_table = None
+        self.__regular = None
 
     @property
     def steps(self):
-        return self.__steps
+        # RouthSteps rebuilt from the step log on first access: indexable like the list of table snapshots
+        if not self.__record_steps:
+            return None
+        return self.__step_log.steps if self.__step_log is not None else []
+
+    @property
+    def step_log(self):
+        return self.__step_log
+
+    @property
+    def regular(self):
+        # True when the last table fill needed no ε pivot or auxiliary row and its first column has no zero
+        return self.__regular
+
+    def is_stable(self):
+        # Asymptotic stability: every coefficient nonzero with one sign and a regular table without sign changes.
+        # Zero pivots and zero rows come from roots on (or mirrored about) the imaginary axis, even without a sign change
+        # None when undetermined: an invalid order, or symbolic coefficients whose signs depend on their symbols
+        sign_change = self.count_sign_changes()
+        if sign_change is None or self.__exact_coeffs() is None:
+            return None
+        return sign_change == 0 and self.__regular and RouthStabilitySolver.__same_sign(self.__coeffs)
+
+    @staticmethod
+    def __same_sign(coeffs):
+        return all(coeff > 0 for coeff in coeffs) or all(coeff < 0 for coeff in coeffs)
 
 
     def set_coeffs(self, coeffs):
@@ -51,7 +92,7 @@ class RouthStabilitySolver():
     def __create_table(self):
 
         if self.__order< 1:
-            print("Error")
+            logger.error("The characteristic equation needs an order of at least 1, got %d coefficients.", len(self.__coeffs))
             return
 
         rows = self.__order +1
@@ -92,7 +133,7 @@ class RouthStabilitySolver():
         step_aux = []
 
         for i in range(len(auxiliary_row)):
-            if auxiliary_row[i] * power>= 0 and auxiliary_row[i] !=0:
+            if power >= 0 and auxiliary_row[i] != 0:
 
                 # perform d/ds if power is >=0
                 modified_aux_element = auxiliary_row[i] * power
@@ -112,20 +153,289 @@ class RouthStabilitySolver():
     def solve(self):
 
         if self.__order< 1:
-            print("Error")
+            logger.error("The characteristic equation needs an order of at least 1, got %d coefficients.", len(self.__coeffs))
             return
 
+        sign_change = self.count_sign_changes()
+
+        # Build the characteristic equation
+        rhp_roots = []
+        characteristic_eqn = 0
+        s = RouthStabilitySolver.__s
+        for i , coeff in enumerate(self.__coeffs):
+                characteristic_eqn+= coeff*s**(self.__order-i)
+
+
+
+
+        # Extracting RHP
+        if(sign_change >0):
+            with self.__stats.stage('roots'):
+                coeffs = self.__exact_coeffs()
+                if self.__symbolic_roots or coeffs is None:
+                    rhp_roots = self.__symbolic_rhp_roots(characteristic_eqn)
+                else:
+                    # Exact coefficients give an exact square-free part, only float input can leave a split repeated root
+                    inexact = any(not isinstance(coeff, numbers.Rational) for coeff in self.__coeffs)
+                    rhp_roots = self.__numeric_rhp_roots(RouthStabilitySolver.__square_free(coeffs), cluster=inexact)
+            self.__stats.count('rhp_roots', len(rhp_roots))
+
+        return sign_change, rhp_roots , f"{sp.latex(characteristic_eqn)}=0" , self.steps
+
+    @staticmethod
+    def __root_latex(real_part, imag_part):
+        # Create the real + imag*i format
+        if imag_part != 0:
+            return f"{sp.latex(real_part)} + ({sp.latex(imag_part)})\\cdot\\mathrm{{i}}"
+        return f"{sp.latex(real_part)}"
+
+    def __symbolic_rhp_roots(self, characteristic_eqn):
+        rhp_roots = []
+        roots = sp.solve(characteristic_eqn , RouthStabilitySolver.__s)
+        # Seperate real and imaginary parts in x+yi format
+        for root in roots:
+            root_eval = root.evalf()
+            real_part = sp.re(root_eval)
+            imag_part = sp.im(root_eval)
+
+            if real_part > 0:
+                rhp_roots.append(RouthStabilitySolver.__root_latex(real_part, imag_part))
+        return rhp_roots
+
+    @staticmethod
+    def __square_free(coeffs):
+        # p / gcd(p, p') in exact arithmetic: every root is simple and listed once, like sp.solve lists them
+        poly = sp.Poly([sp.Rational(coeff.numerator, coeff.denominator) for coeff in coeffs], RouthStabilitySolver.__s, domain='QQ')
+        return [float(coeff) for coeff in poly.sqf_part().all_coeffs()]
+
+    def __numeric_rhp_roots(self, coeffs, tolerance=1e-9, polish_steps=3, cluster=True, cluster_tolerance=1e-5):
+        # Eigenvalues of the companion matrix, polished with a few Newton steps
+        derivative = np.polyder(coeffs)
+        polished_roots = []
+        for root in np.roots(coeffs):
+            for _ in range(polish_steps):
+                slope = np.polyval(derivative, root)
+                if slope == 0:
+                    break
+                polished = root - np.polyval(coeffs, root) / slope
+                if abs(np.polyval(coeffs, polished)) >= abs(np.polyval(coeffs, root)):
+                    break
+                root = polished
+            polished_roots.append(root)
+
+        # A repeated root that survived in float coefficients splits into a tight cluster, report its mean once
+        clusters = []
+        for root in polished_roots:
+            for members in clusters if cluster else []:
+                if abs(root - members[0]) <= cluster_tolerance * max(1.0, abs(members[0])):
+                    members.append(root)
+                    break
+            else:
+                clusters.append([root])
+
+        rhp_roots = []
+        for members in clusters:
+            root = sum(members) / len(members)
+
+            # Roots on the imaginary axis and real roots come back with round-off in the other part
+            size = max(1.0, abs(root))
+            real_part = root.real if abs(root.real) > tolerance * size else 0.0
+            imag_part = root.imag if abs(root.imag) > tolerance * size else 0.0
+            if real_part > 0:
+                rhp_roots.append((real_part, imag_part))
+
+        return [
+            RouthStabilitySolver.__root_latex(sp.Float(real_part), sp.Float(imag_part) if imag_part else 0)
+            for real_part, imag_part in sorted(rhp_roots)
+        ]
+
+    def count_sign_changes(self):
+        # Fills the table (and its steps) without extracting any roots
+        if self.__order < 1:
+            logger.error("The characteristic equation needs an order of at least 1, got %d coefficients.", len(self.__coeffs))
+            return
+
+        self.__step_log = None
+        self.__regular = True
+
+        # Exact arithmetic for numeric coefficients, ε/auxiliary-row handling only when a zero pivot shows up
+        with self.__stats.stage('table'):
+            with self.__stats.stage('table.exact'):
+                sign_change = self.__solve_numeric()
+            if sign_change is None:
+                with self.__stats.stage('table.limits'):
+                    sign_change = self.__solve_symbolic()
+                    self.__regular = self.__regular and all(self.__routh_table[row, 0] != 0 for row in range(self.__routh_table.rows))
+        self.__stats.count('rows', self.__order + 1)
+        return sign_change
+
+    @staticmethod
+    def screen(coeffs, tolerance=1e-9):
+        # Stability of many polynomials at once: coeffs is an (N x order+1) array, highest power first.
+        # The first columns are computed in float64 for the whole batch; rows that hit a (near) zero pivot
+        # are recomputed one by one on the exact path. Returns (sign changes, stable flags); stable also needs
+        # coefficients of one sign and no zero pivot or zero row, so marginally stable polynomials are not stable
+        coeffs = np.asarray(coeffs)
+        if coeffs.ndim != 2 or coeffs.shape[1] < 2:
+            raise ValueError("Expected an (N x order+1) coefficient array with order >= 1.")
+
+        count, length = coeffs.shape
+        cols = (length + 1) // 2
+        values = coeffs.astype(float)
+
+        previous = np.zeros((count, cols))
+        current = np.zeros((count, cols))
+        previous[:, :len(range(0, length, 2))] = values[:, 0::2]
+        current[:, :len(range(1, length, 2))] = values[:, 1::2]
+
+        # Which cells are calculated at all, following the same rule as the single polynomial table
+        previous_needed = previous != 0
+        current_needed = current != 0
+
+        scale = np.abs(values).max(axis=1) * tolerance
+        exact = (np.abs(previous[:, 0]) <= scale) | (np.abs(current[:, 0]) <= scale)
+        sign_changes = (previous[:, 0] * current[:, 0] < 0).astype(int)
+
+        for _ in range(length - 2):
+            needed = np.zeros((count, cols), dtype=bool)
+            needed[:, :-1] = np.logical_and.accumulate(previous_needed[:, 1:] | current_needed[:, 1:], axis=1)
+
+            following = np.zeros((count, cols))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                following[:, :-1] = (current[:, :1] * previous[:, 1:] - previous[:, :1] * current[:, 1:]) / current[:, :1]
+                following = np.where(needed, following, 0)
+
+                # Rows flagged here may already hold nan / inf, they get recounted below
+                exact |= ~needed[:, 0] | ~(np.abs(following[:, 0]) > scale)
+                sign_changes += following[:, 0] * current[:, 0] < 0
+
+            previous, current = current, following
+            previous_needed, current_needed = current_needed, needed
+
+        # Rows that stayed on the float path had no (near) zero pivot, so their tables are regular
+        regular = np.ones(count, dtype=bool)
+        for row in np.flatnonzero(exact):
+            solver = RouthStabilitySolver(coeffs[row].tolist(), record_steps=False)
+            sign_changes[row] = solver.count_sign_changes()
+            regular[row] = solver.regular
+
+        same_sign = (values > 0).all(axis=1) | (values < 0).all(axis=1)
+        return sign_changes, (sign_changes == 0) & regular & same_sign
+
+    def __exact_coeffs(self):
+        # Coefficients as Fractions, or None when any of them is symbolic
+        exact = []
+        for coeff in self.__coeffs:
+            if isinstance(coeff, numbers.Rational):
+                exact.append(Fraction(int(coeff.numerator), int(coeff.denominator)))
+            elif isinstance(coeff, numbers.Real):
+                exact.append(Fraction(float(coeff)))
+            else:
+                return None
+        return exact
+
+    def __numeric_latex(self, value):
+        if self.__float_display:
+            return sp.latex(sp.Float(float(value)))
+        if value.denominator == 1:
+            return str(value.numerator)
+        sign = '- ' if value < 0 else ''
+        return f"{sign}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+
+    def __numeric_display(self, value):
+        return float(value) if self.__float_display else value
+
+    def __solve_numeric(self):
+        # Same table and steps as __solve_symbolic, filled with exact Fraction arithmetic.
+        # Returns None as soon as a zero pivot or zero row needs the ε / auxiliary-row treatment
+        coeffs = self.__exact_coeffs()
+        if coeffs is None:
+            return None
+        self.__float_display = any(isinstance(coeff, float) for coeff in self.__coeffs)
+
+        rows = self.__order + 1
+        cols = (rows + 1) // 2
+        table = [[Fraction(0)] * cols for _ in range(rows)]
+
+        for i, j in zip(range(0, rows - 1, 2), range(cols)):
+            table[0][j] = coeffs[i]
+            table[1][j] = coeffs[i + 1]
+        if len(coeffs) % 2 != 0:
+            table[0][cols - 1] = coeffs[-1]
+
+        # Cells that need calculations, marked exactly like __create_table does
+        needed = [[False] * cols for _ in range(rows)]
+        for i in range(rows - 2):
+            for j in range(cols - 1):
+                if table[i][j + 1] != 0 or needed[i][j + 1] or table[i + 1][j + 1] != 0 or needed[i + 1][j + 1]:
+                    needed[i + 2][j] = True
+                else:
+                    break
+
+        if table[1][0] == 0:
+            return None
+
+        self.__create_var_col()
+        step_log = None
+        if self.__record_steps:
+            step_log = RouthStepLog(
+                [var] + [RouthStabilitySolver.__X if needed[i][j] else self.__numeric_display(table[i][j]) for j in range(cols)]
+                for i, var in enumerate(self.__var_col)
+            )
+
+        sign_change = 1 if table[0][0] * table[1][0] < 0 else 0
+
+        for row in range(rows - 2):
+            if not needed[row + 2][0]:
+                return None
+
+            r1 = table[row][0]
+            r2 = table[row + 1][0]
+
+            for col in range(cols):
+                if not needed[row + 2][col]:
+                    break
+
+                l1 = table[row][col + 1]
+                l2 = table[row + 1][col + 1]
+                val = (r2 * l1 - r1 * l2) / r2
+
+                if val == 0 and col == 0:
+                    return None
+
+                if step_log is not None:
+                    step_log.cell(
+                        row + 2, col,
+                        f"\\frac{{{self.__numeric_latex(r2)} \\cdot {self.__numeric_latex(l1)} - {self.__numeric_latex(r1)} \\cdot {self.__numeric_latex(l2)}}}{{{self.__numeric_latex(r2)}}} = {self.__numeric_latex(val)}",
+                        self.__numeric_display(val)
+                    )
+                table[row + 2][col] = val
+
+            sign_change += 1 if table[row + 2][0] * table[row + 1][0] < 0 else 0
+
+        self.__step_log = step_log
+        return sign_change
+
+    def __solve_symbolic(self):
         # Create Table
         self.__create_table()
         rows = self.__routh_table.rows
         cols = self.__routh_table.cols
 
-        # Change 2nd row 1st element from 0 -> ε to avoid division by zero
-        self.__routh_table[1 , 0] = RouthStabilitySolver.__ε if self.__routh_table[1,0] == 0 and rows >1 else self.__routh_table[1,0]
-
+        # Start the step log from the table before any ε substitution
+        step_log = None
+        if self.__record_steps:
+            first_table = self.__routh_table.tolist()
+            for row , var in zip(first_table , self.__var_col):
+                row.insert(0,var)
+            step_log = RouthStepLog(first_table)
 
-        # Create Step Matrix and its row count
-        step = self.__routh_table.tolist()
+        # Change 2nd row 1st element from 0 -> ε to avoid division by zero
+        if self.__routh_table[1,0] == 0 and rows >1:
+            self.__routh_table[1 , 0] = RouthStabilitySolver.__ε
+            self.__regular = False
+            if step_log is not None:
+                step_log.epsilon(1, 0, RouthStabilitySolver.__ε)
 
 
 
@@ -135,10 +445,6 @@ class RouthStabilitySolver():
 
 
 
-        for row , var in zip(step , self.__var_col):
-            row.insert(0,var)
-
-        self.__steps.append(copy.deepcopy(step))
         for row in range(self.__routh_table.rows - 2):
 
             r1= self.__routh_table[row,0]
@@ -146,7 +452,6 @@ class RouthStabilitySolver():
 
 
 
-            row_step = []
 
             for col in range(self.__routh_table.cols):
 
@@ -162,32 +467,35 @@ class RouthStabilitySolver():
 
                 # Handles Limit
                 final_val = sp.limit(val , RouthStabilitySolver.__ε, 0)
+                self.__stats.count('limits')
 
-                limit_expr = "\\lim_{{\\varepsilon \\to 0}}" + sp.latex(val) if 'ε' in str(val) and '/' in str(val) else None
-
-
-                # Adds the equation leading to the column value
-                row_step.append(
-                    f"\\frac{{{sp.latex(r2)} \\cdot {sp.latex(l1)} - {sp.latex(r1)} \\cdot {sp.latex(l2)}}}{{{sp.latex(r2)}}} = {limit_expr if limit_expr is not None else sp.latex(val)}"
-                )
+                # Handles final values for limits
+                if final_val == sp.oo:
+                    value = RouthStabilitySolver.__infinity
 
+                elif final_val == -sp.oo:
+                    value = RouthStabilitySolver.__neg_infinity
 
+                else:
+                    value = final_val
 
-                if val != RouthStabilitySolver.__ε and val != final_val:
-                    row_step[-1]+=('=' + str(final_val))
+                self.__routh_table[row + 2,col] = value
 
-                # Handles final values for limits
-                if final_val == sp.oo:
-                    self.__routh_table[row + 2,col] = RouthStabilitySolver.__infinity
+                if step_log is not None:
+                    limit_expr = "\\lim_{{\\varepsilon \\to 0}}" + sp.latex(val) if 'ε' in str(val) and '/' in str(val) else None
 
-                elif final_val == -sp.oo:
-                    self.__routh_table[row + 2,col] = RouthStabilitySolver.__neg_infinity
+                    # Logs the equation leading to the column value
+                    formula = f"\\frac{{{sp.latex(r2)} \\cdot {sp.latex(l1)} - {sp.latex(r1)} \\cdot {sp.latex(l2)}}}{{{sp.latex(r2)}}} = {limit_expr if limit_expr is not None else sp.latex(val)}"
+                    if val != RouthStabilitySolver.__ε and val != final_val:
+                        formula+=('=' + str(final_val))
+                    step_log.cell(row + 2, col, formula, value)
 
-                elif final_val == 0 and col == 0:
+                # A zero pivot continues as ε
+                if final_val == 0 and col == 0:
                     self.__routh_table[row + 2,col] = RouthStabilitySolver.__ε
-
-                else:
-                    self.__routh_table[row + 2,col] = final_val
+                    self.__regular = False
+                    if step_log is not None:
+                        step_log.epsilon(row + 2, col, RouthStabilitySolver.__ε)
 
 
             # Checks for sign change
@@ -201,58 +509,15 @@ class RouthStabilitySolver():
 
             # Handles Zero Row
             if self.__routh_table[row + 2, 0] == RouthStabilitySolver.__ε and self.__routh_table[row + 2, 1:].tolist() == [[0]*(cols - 1)]:
-                row_step = []
                 aux_step ,aux_row = self.__auxiliary_row(row+1)
-                row_step = aux_step
+                self.__stats.count('auxiliary_rows')
                 self.__routh_table[row+2 , :] = aux_row
-                step[row+2][1:] = row_step
-            else:
-                step[row+2][1:] = row_step+[0]*(cols - len(row_step))
-
-
-
-
-
-            # Add the step
-            self.__steps.append(copy.deepcopy(step))
-            step[row+2][1:] = self.__routh_table[row + 2, 0:]
-
-        # Add the final table
-        self.__steps.append(copy.deepcopy(step))
-
-
-        # Build the characteristic equation
-        rhp_roots = []
-        characteristic_eqn = 0
-        s = RouthStabilitySolver.__s
-        for i , coeff in enumerate(self.__coeffs):
-                characteristic_eqn+= coeff*s**(self.__order-i)
-
-
-
-
-        # Extracting RHP
-        if(sign_change >0):
-
-            roots = sp.solve(characteristic_eqn , s)
-            # Seperate real and imaginary parts in x+yi format
-            for root in roots:
-                root_eval = root.evalf()
-                real_part = sp.re(root_eval)
-                imag_part = sp.im(root_eval)
-
-                if real_part > 0:
-                    # Create the real + imag*i format
-                    if imag_part != 0:
-                        root_str = f"{sp.latex(real_part)} + ({sp.latex(imag_part)})\\cdot\\mathrm{{i}}"
-                    else:
-                        root_str = f"{sp.latex(real_part)}"
-                    rhp_roots.append(root_str)
-
-
-
+                self.__regular = False
+                if step_log is not None:
+                    step_log.auxiliary(row + 2, aux_step, aux_row)
 
-        return sign_change, rhp_roots , f"{sp.latex(characteristic_eqn)}=0" , self.__steps
+        self.__step_log = step_log
+        return sign_change
 
 
 
@@ -0,0 +1,133 @@
+from bisect import bisect_right
+
+
+class RouthSteps:
+    # The steps of a Routh table as row diffs: the first table, then for every later step only the rows it changed.
+    # Each step rewrites at most two rows, so n steps of an n-row table take O(n * cols) cells instead of O(n² * cols).
+    # Rows and whole snapshots are rebuilt on demand, a snapshot is the table as the step list used to store it
+    def __init__(self, first_table):
+        self.__history = [[list(row)] for row in first_table]  # row -> cells after each change
+        self.__changed_at = [[0] for _ in first_table]  # row -> steps that changed it, ascending
+        self.__changed_rows = [list(range(len(first_table)))]  # step -> changed rows
+
+    @classmethod
+    def from_snapshots(cls, snapshots):
+        steps = cls(snapshots[0])
+        for previous, current in zip(snapshots, snapshots[1:]):
+            steps.add_step({i: row for i, (old, row) in enumerate(zip(previous, current)) if old != row})
+        return steps
+
+    def add_step(self, changes):
+        # changes: {row index: full row}, the other rows keep their cells from the step before
+        step = len(self.__changed_rows)
+        for row, cells in changes.items():
+            self.__history[row].append(list(cells))
+            self.__changed_at[row].append(step)
+        self.__changed_rows.append(sorted(changes))
+
+    def __len__(self):
+        return len(self.__changed_rows)
+
+    @property
+    def row_count(self):
+        return len(self.__history)
+
+    @property
+    def column_count(self):
+        return max((len(history[0]) for history in self.__history), default=0)
+
+    def changed_rows(self, step):
+        return self.__changed_rows[step]
+
+    def row(self, step, row):
+        step = self.__index(step)
+        return self.__history[row][bisect_right(self.__changed_at[row], step) - 1]
+
+    def __index(self, step):
+        if not -len(self) <= step < len(self):
+            raise IndexError("step index out of range")
+        return step % len(self)
+
+    def __getitem__(self, step):
+        if isinstance(step, slice):
+            return [self[index] for index in range(*step.indices(len(self)))]
+        step = self.__index(step)
+        return [list(self.row(step, row)) for row in range(self.row_count)]
+
+    def __iter__(self):
+        return (self[step] for step in range(len(self)))
+
+
+class RouthStepLog:
+    # Append-only record of a table fill, written by RouthStabilitySolver instead of copying the table after every row:
+    # the starting table, then one event per computed cell, auxiliary row and ε substitution.
+    # Rows 2 and below are computed one per step, so the steps (as RouthSteps) are rebuilt from the events on first use
+    def __init__(self, first_table):
+        self.__first_table = [list(row) for row in first_table]  # rows start with their S label
+        self.__events = []
+        self.__steps = None
+
+    def cell(self, row, col, formula, value):
+        self.__events.append(('cell', row, col, formula, value))
+        self.__steps = None
+
+    def auxiliary(self, row, formulas, values):
+        # A zero row replaced by the derivative of the auxiliary polynomial, formulas cover the whole row
+        self.__events.append(('auxiliary', row, list(formulas), list(values)))
+        self.__steps = None
+
+    def epsilon(self, row, col, symbol):
+        # A zero first column cell replaced by ε
+        self.__events.append(('epsilon', row, col, symbol))
+        self.__steps = None
+
+    @property
+    def events(self):
+        return list(self.__events)
+
+    @property
+    def steps(self):
+        if self.__steps is None:
+            self.__steps = self.__replay()
+        return self.__steps
+
+    def __replay(self):
+        events_by_row = {}
+        for event in self.__events:
+            events_by_row.setdefault(event[1], []).append(event)
+
+        # Substitutions in the two coefficient rows are part of the first table
+        values = [list(row) for row in self.__first_table]
+        for row in (0, 1):
+            for _, _, col, symbol in events_by_row.get(row, []):
+                values[row][col + 1] = symbol
+        steps = RouthSteps(values)
+
+        previous = None
+        for row in range(2, len(values)):
+            formulas = []
+            padded = True
+            for event in events_by_row.get(row, []):
+                if event[0] == 'cell':
+                    _, _, col, formula, value = event
+                    formulas.append(formula)
+                    values[row][col + 1] = value
+                elif event[0] == 'auxiliary':
+                    formulas, padded = event[2], False
+                    values[row][1:] = event[3]
+                else:
+                    values[row][event[2] + 1] = event[3]
+
+            if padded:
+                formulas = formulas + [0] * (len(values[row]) - 1 - len(formulas))
+            changes = {row: [values[row][0]] + formulas}
+            if previous is not None:
+                changes[previous] = values[previous]
+            steps.add_step(changes)
+            previous = row
+
+        if previous is not None:
+            steps.add_step({previous: values[previous]})
+        else:
+            steps.add_step({})
+        return steps
@@ -1,14 +1,12 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel,
                            QScrollArea, QPushButton, QFrame,
-                           QTableWidget, QSpinBox , QHBoxLayout,QSizePolicy, QMainWindow, QLineEdit, QApplication,QTableWidgetItem)
+                           QTableWidget, QTableView, QSpinBox , QHBoxLayout,QSizePolicy, QMainWindow, QLineEdit, QApplication,QTableWidgetItem, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPixmap
-import matplotlib
-from matplotlib import pyplot as plt
-matplotlib.use("Agg")
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from Shared.gui.Latex_Renderer import render_image
+from Shared.gui.Render_Worker import RenderWorker
 from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
-import io
+from Routh_Stability.gui.Routh_Step_Model import RouthStepModel
 import sys
 
 
@@ -65,6 +63,8 @@ class RouthStability(QMainWindow):
         layout.addLayout(button_layout)
 
     def go_back(self):
+        if hasattr(self, 'worker'):
+            self.worker.cancel()
         self.close()
         self.parent().show()
 
@@ -92,10 +92,7 @@ class RouthStability(QMainWindow):
                 coeffs = coeffs[i:]
                 break
 
-        self.solver = RouthStabilitySolver(coeffs)
-        sign_changes, rhp_roots , characteristic_eqn, steps = self.solver.solve()
-        self.display_result(steps, characteristic_eqn, sign_changes, rhp_roots)
-        # self.display_result(test)
+        self.display_result(coeffs)
 
     def characteristic_table(self, colums):
         table = QTableWidget()
@@ -130,34 +127,7 @@ class RouthStability(QMainWindow):
 
         return table
 
-    def render_latex_to_pixmap(self, latex_str):
-        fig = plt.figure(figsize=(0.01, 0.01))
-        text = fig.text(
-                0, 0, f"${latex_str}$",
-                fontsize=16,
-                fontfamily="monospace",  # or "sans-serif", "monospace", etc.
-                fontweight="bold",     # optional: "normal", "bold", "light"
-                color="white"
-            )
-        fig.patch.set_alpha(0.0)
-
-        canvas = FigureCanvas(fig)
-        canvas.draw()
-        bbox = text.get_window_extent()
-        width, height = bbox.size
-        width, height = int(width), int(height)
-        fig.set_size_inches(width / fig.dpi, height / fig.dpi)
-        canvas.draw()
-
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", dpi=fig.dpi, bbox_inches='tight', transparent=True, pad_inches=0.05)
-        plt.close(fig)
-
-        pixmap = QPixmap()
-        pixmap.loadFromData(buf.getvalue())
-        return pixmap
-
-    def display_result(self, result, characteristic_eqn , sign_changes , rhp_roots):
+    def display_result(self, coeffs):
         self.setGeometry(0, 0, 1000, 800)  # Make window larger
         self.center_window()
         self.setWindowTitle("Routh Stability Result")
@@ -184,162 +154,154 @@ class RouthStability(QMainWindow):
         self.scroll_area.setWidget(self.scroll_content)
         self.centralWidget().layout().addWidget(self.scroll_area)
 
-        #Create break lines
-        lines = []
-
-        for _ in range(4):
-            line = QFrame()
-            line.setFrameShape(QFrame.Shape.HLine)
-            line.setFrameShadow(QFrame.Shadow.Sunken)
-            lines.append(line)
-
-
-        # Shows System Characteristic Equation
-        characteristic_eqn_label = QLabel()
-        characteristic_eqn_label.setPixmap(self.render_latex_to_pixmap(characteristic_eqn))
-        self.scroll_layout.addWidget(characteristic_eqn_label)
-
-        self.scroll_layout.addWidget(lines[0])
-
-        # Shows System Stability
-        stability_label = QLabel("The System is " + ("Stable" if sign_changes==0 else "Unstable"))
-        stability_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        stability_label.setStyleSheet("color: white; margin: 10px;")
-        self.scroll_layout.addWidget(stability_label)
-
-
-
-
-        self.scroll_layout.addWidget(lines[1])
-
-
-
-        # Shows No of sign changes
-        sign_label = QLabel(f"Number of Sign Changes: {sign_changes}")
-        sign_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        sign_label.setStyleSheet("color: white; margin: 10px;")
-        self.scroll_layout.addWidget(sign_label)
-
-
-        self.scroll_layout.addWidget(lines[2])
-
-
-
-        # Shows roots in Right hand side of s-plane
-        if rhp_roots != []:
-            roots_label = QLabel("Roots in positive s-plane side:\n")
-            roots_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-            roots_label.setStyleSheet("color: white; margin: 10px;")
-            self.scroll_layout.addWidget(roots_label)
-
-            for i, root in enumerate(rhp_roots):
-
-                root_latex = f"\\mathrm{{r}}_{{{i}}} = {root}"
-                root_label = QLabel()
-                root_label.setPixmap(self.render_latex_to_pixmap(f"\\bullet {root_latex}"))
-
-                self.scroll_layout.addWidget(root_label)
-
-
-            self.scroll_layout.addWidget(lines[3])
-
-
-
-
-        for step_index, step in enumerate(result):
-
-            step_label = QLabel(f"Step {step_index + 1}")
-            step_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-            step_label.setStyleSheet("margin-top: 10px; color: white;")
-            self.scroll_layout.addWidget(step_label)
-
-            table = QTableWidget()
-            table.horizontalHeader().setVisible(False)  # Hide horizontal header
-            table.verticalHeader().setVisible(False)  # Hide vertical header
-
-
-
-            # Determine table size from the number of rows and columns in the result
-            num_rows = len(step)
-            num_columns = max(len(row) for row in step)
-
-            table.setRowCount(num_rows)
-            table.setColumnCount(num_columns)
-
-            # Set the table size (this will help prevent tables from being too small)
-            table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-
-            # Set minimum height and width for the table and labels to ensure visibility
-            max_height = 80*len(result[0]) + 20
-            threshold_height = 80*10 + 20
-
-            if(max_height<threshold_height):
-                table.setMinimumHeight(max_height)
-                table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            else:
-                table.setMinimumHeight(threshold_height)
-
-            table.setMinimumWidth(600)
-
-
-            # Set row and column sizes dynamically based on content size
-            for i in range(table.rowCount()):
-                table.setRowHeight(i, 80)  # Adjust row height to allow for bigger expressions
-            for j in range(table.columnCount()):
-                table.setColumnWidth(j, 150)  # Adjust column width
-
-
-
-            # Set Highlighted Row
-            highlight_row_index = step_index + 1 if 1 <= step_index < len(result) - 1  else -1
-
-
-
-            # Populate the table with data
-            for i, row in enumerate(step):
-                highlighted = i == highlight_row_index
-                for j, column in enumerate(row):
-                    label = QLabel()
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    if highlighted:
-                        pixmap = self.render_latex_to_pixmap(column)
-                        label.setPixmap(pixmap)
-
-                        pix_width = pixmap.width()
-                        pix_height = pixmap.height()
-                        label.setMinimumSize(pix_width, pix_height)
-
-                        label.setStyleSheet("font-weight: bold; background-color: rgba(255,255,255,0.05);")
-                        table.setColumnWidth(j, max(table.columnWidth(j), pix_width))
-                        table.setRowHeight(i, max(table.rowHeight(i), pix_height))
-                    else:
-                        label.setText(str(column))
-                        label.setFont(QFont("Arial", 13))
-                        label.setStyleSheet("color: white;")  # Optional: white plain text
-                        label.setMinimumSize(50, 30)
-
-                    label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-                    table.setCellWidget(i, j, label)
-
-
-
-
-            table.setStyleSheet("QTableWidget { margin: 10px; }")
-            self.scroll_layout.addWidget(table)
+        # Solving and rendering run on the thread pool, results replace the placeholder as they arrive
+        self.placeholder = QLabel("Computing...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setFont(QFont("Arial", 14))
+        self.placeholder.setStyleSheet("color: #8a8a8a; margin: 10px;")
+        self.scroll_layout.addWidget(self.placeholder)
 
         self.scroll_layout.addStretch()
 
-        # Back button fixed at the bottom
+        # Cancel and Back buttons fixed at the bottom
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("padding: 10px; margin: 10px;")
+
         self.back_button = QPushButton("Back")
         self.back_button.setStyleSheet("padding: 10px; margin: 10px;")
         self.back_button.clicked.connect(self.go_back)
 
+        central_layout.addWidget(self.cancel_button, alignment=Qt.AlignmentFlag.AlignBottom)
         central_layout.addWidget(self.back_button, alignment=Qt.AlignmentFlag.AlignBottom)
 
-
-
-
+        self.worker = RenderWorker(_result_items(coeffs))
+        self.worker.signals.ready.connect(self.__place_result)
+        self.worker.signals.failed.connect(lambda message: QMessageBox.warning(self, "Warning", message))
+        self.worker.signals.finished.connect(self.__result_done)
+        self.cancel_button.clicked.connect(self.worker.cancel)
+        self.worker.start()
+
+    def __add_result_widget(self, widget):
+        self.scroll_layout.insertWidget(self.scroll_layout.indexOf(self.placeholder), widget)
+
+    def __add_break_line(self):
+        line = QFrame()
+        line.setFrameShape(QFrame.Shape.HLine)
+        line.setFrameShadow(QFrame.Shadow.Sunken)
+        self.__add_result_widget(line)
+
+    def __add_heading(self, text, size=18):
+        label = QLabel(text)
+        label.setFont(QFont("Arial", size, QFont.Weight.Bold))
+        label.setStyleSheet("color: white; margin: 10px;")
+        self.__add_result_widget(label)
+
+    def __place_result(self, key, payload):
+        if key == 'summary':
+            characteristic_eqn, sign_changes, rhp_roots = payload
+
+            # Shows System Characteristic Equation
+            characteristic_eqn_label = QLabel()
+            characteristic_eqn_label.setPixmap(QPixmap.fromImage(characteristic_eqn))
+            self.__add_result_widget(characteristic_eqn_label)
+            self.__add_break_line()
+
+            # Shows System Stability
+            self.__add_heading("The System is " + ("Stable" if sign_changes==0 else "Unstable"))
+            self.__add_break_line()
+
+            # Shows No of sign changes
+            self.__add_heading(f"Number of Sign Changes: {sign_changes}")
+            self.__add_break_line()
+
+            # Shows roots in Right hand side of s-plane
+            self.__has_roots = rhp_roots != []
+            if self.__has_roots:
+                self.__add_heading("Roots in positive s-plane side:\n")
+
+        elif key == 'root':
+            root_label = QLabel()
+            root_label.setPixmap(QPixmap.fromImage(payload))
+            self.__add_result_widget(root_label)
+
+        elif key == 'steps':
+            if self.__has_roots:
+                self.__add_break_line()
+            self.__add_step_viewer(payload)
+
+    def __add_step_viewer(self, steps):
+        # A single table showing one step at a time, the step is picked with the spin box
+        selector = QWidget()
+        selector_layout = QHBoxLayout(selector)
+
+        step_label = QLabel("Step")
+        step_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        step_label.setStyleSheet("margin-top: 10px; color: white;")
+
+        self.step_selector = QSpinBox()
+        self.step_selector.setRange(1, len(steps))
+
+        step_count_label = QLabel(f"of {len(steps)}")
+        step_count_label.setFont(QFont("Arial", 14))
+
+        selector_layout.addWidget(step_label)
+        selector_layout.addWidget(self.step_selector)
+        selector_layout.addWidget(step_count_label)
+        selector_layout.addStretch()
+        self.__add_result_widget(selector)
+
+        self.step_model = RouthStepModel(steps, self)
+        self.step_view = QTableView()
+        self.step_view.setModel(self.step_model)
+        self.step_view.horizontalHeader().setVisible(False)  # Hide horizontal header
+        self.step_view.verticalHeader().setVisible(False)  # Hide vertical header
+        self.step_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+        # Rows and columns share default sizes, only the highlighted row is measured
+        self.step_view.verticalHeader().setDefaultSectionSize(80)
+        self.step_view.horizontalHeader().setDefaultSectionSize(150)
+
+        # Set minimum height and width for the table to ensure visibility
+        max_height = 80*steps.row_count + 20
+        threshold_height = 80*10 + 20
+
+        if(max_height<threshold_height):
+            self.step_view.setMinimumHeight(max_height)
+            self.step_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        else:
+            self.step_view.setMinimumHeight(threshold_height)
+
+        self.step_view.setMinimumWidth(600)
+        self.step_view.setStyleSheet("QTableView { margin: 10px; }")
+        self.__add_result_widget(self.step_view)
+
+        self.step_selector.valueChanged.connect(lambda value: self.__show_step(value - 1))
+        self.__show_step(0)
+
+    def __show_step(self, step):
+        previous_row = self.step_model.highlight_row
+        self.step_model.set_step(step)
+        if previous_row != -1:
+            self.step_view.setRowHeight(previous_row, 80)
+
+        row = self.step_model.highlight_row
+        if row == -1:
+            return
+
+        # Fit the highlighted row and its columns to the rendered formulas, then bring it into view
+        self.step_view.resizeRowToContents(row)
+        for column in range(self.step_model.columnCount()):
+            hint = self.step_model.data(self.step_model.index(row, column), Qt.ItemDataRole.SizeHintRole)
+            if hint is not None:
+                self.step_view.setColumnWidth(column, max(self.step_view.columnWidth(column), hint.width()))
+        self.step_view.scrollTo(self.step_model.index(row, 0))
+
+    def __result_done(self, completed):
+        if completed:
+            self.placeholder.hide()
+        else:
+            self.placeholder.setText("Cancelled")
+        self.cancel_button.hide()
 
     def center_window(self):
         screen = QApplication.primaryScreen().geometry()
@@ -349,6 +311,8 @@ class RouthStability(QMainWindow):
         self.move(x, y)
 
     def closeEvent(self, event):
+        if hasattr(self, 'worker'):
+            self.worker.cancel()
         if self.parent() is None:
             event.accept()
             sys.exit(0)
@@ -357,7 +321,14 @@ class RouthStability(QMainWindow):
             self.close()
 
 
+def _result_items(coeffs):
+    # Runs on the worker thread: solves and renders, yielding the summary, the roots and then the steps
+    sign_changes, rhp_roots , characteristic_eqn, steps = RouthStabilitySolver(coeffs).solve()
+    yield 'summary', (render_image(characteristic_eqn), sign_changes, rhp_roots)
 
+    for i, root in enumerate(rhp_roots):
+        root_latex = f"\\mathrm{{r}}_{{{i}}} = {root}"
+        yield 'root', render_image(f"\\bullet {root_latex}")
 
-
-
+    # RouthSteps row diffs replayed from the solver's step log, the view renders the formulas it shows
+    yield 'steps', steps
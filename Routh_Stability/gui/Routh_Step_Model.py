@@ -0,0 +1,60 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSize, Qt
+from PyQt6.QtGui import QColor, QFont
+from Shared.gui.Latex_Renderer import render_pixmap
+
+
+class RouthStepModel(QAbstractTableModel):
+    # One Routh step at a time, read from the RouthSteps row diffs.
+    # The view only asks for the cells it paints, so formulas are rendered for the visible part of the table only
+    CELL_FONT = QFont("Arial", 13)
+    HIGHLIGHT = QColor(255, 255, 255, 13)
+
+    def __init__(self, steps, parent=None):
+        super().__init__(parent)
+        self.__steps = steps
+        self.__step = 0
+
+    @property
+    def step(self):
+        return self.__step
+
+    @property
+    def highlight_row(self):
+        # The row whose formulas are shown in this step, -1 for the first and the final table
+        return self.__step + 1 if 1 <= self.__step < len(self.__steps) - 1 else -1
+
+    def set_step(self, step):
+        self.__step = step
+        if self.__steps.row_count:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.__steps.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.__steps.column_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.__steps.row(self.__step, index.row())
+        if index.column() >= len(row):
+            return None
+        cell = row[index.column()]
+        highlighted = index.row() == self.highlight_row
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return None if highlighted else str(cell)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return render_pixmap(str(cell)) if highlighted else None
+        if role == Qt.ItemDataRole.SizeHintRole and highlighted:
+            pixmap = render_pixmap(str(cell))
+            return QSize(pixmap.width(), pixmap.height())
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self.CELL_FONT
+        if role == Qt.ItemDataRole.BackgroundRole and highlighted:
+            return self.HIGHLIGHT
+        return None
@@ -0,0 +1,67 @@
+import math
+import threading
+from functools import lru_cache
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PyQt6.QtGui import QImage, QPixmap
+
+
+# LaTeX (mathtext) formulas rendered straight from the Agg buffer into Qt images, shared by both GUIs.
+# matplotlib's mathtext parser, font cache and Agg renderer are not thread-safe, so every render and cache fill
+# runs under _lock: render_image may be called from QThreadPool workers and the GUI thread at once and returns a QImage,
+# render_pixmap wraps it for the GUI thread (QPixmap must live there)
+PAD_INCHES = 0.05
+_lock = threading.Lock()
+_surface = None
+
+
+def _get_surface():
+    # One off-screen figure, resized for every formula instead of being created and closed. Only used under _lock
+    global _surface
+    if _surface is None:
+        figure = Figure(figsize=(1, 1))
+        figure.patch.set_alpha(0.0)
+        canvas = FigureCanvasAgg(figure)
+        text = figure.text(0, 0, "", horizontalalignment='left', verticalalignment='bottom')
+        _surface = (figure, canvas, text)
+    return _surface
+
+
+def render_image(latex_str, fontsize=16, color="white", dpi=100, family="monospace", weight="bold"):
+    with _lock:
+        return _render_image(latex_str, fontsize, color, dpi, family, weight)
+
+
+@lru_cache(maxsize=2048)
+def _render_image(latex_str, fontsize, color, dpi, family, weight):
+    figure, canvas, text = _get_surface()
+    figure.set_dpi(dpi)
+    text.set_text(f"${latex_str}$")
+    text.set_fontsize(fontsize)
+    text.set_color(color)
+    text.set_fontfamily(family)
+    text.set_fontweight(weight)
+
+    # Measure once (mathtext keeps the parsed layout cached for the draw), then draw once at the final size
+    text.set_position((0, 0))
+    bbox = text.get_window_extent(canvas.get_renderer())
+    pad = math.ceil(PAD_INCHES * dpi)
+    width = math.ceil(bbox.width) + 2 * pad
+    height = math.ceil(bbox.height) + 2 * pad
+    figure.set_size_inches(width / dpi, height / dpi)
+    text.set_position((pad / width, pad / height))
+    canvas.draw()
+
+    # Non premultiplied RGBA straight from the Agg buffer: no PNG encode / decode round trip
+    pixels = np.ascontiguousarray(canvas.buffer_rgba())
+    rows, columns = pixels.shape[:2]
+    return QImage(pixels.tobytes(), columns, rows, columns * 4, QImage.Format.Format_RGBA8888).copy()
+
+
+@lru_cache(maxsize=2048)
+def render_pixmap(latex_str, fontsize=16, color="white", dpi=100, family="monospace", weight="bold"):
+    return QPixmap.fromImage(render_image(latex_str, fontsize, color, dpi, family, weight))
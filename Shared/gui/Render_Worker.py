@@ -0,0 +1,46 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# Runs a solve-and-render job on the global QThreadPool so the GUI thread only places finished results.
+# The job is a generator yielding (key, payload) pairs (payloads are QImages from Latex_Renderer.render_image,
+# text or plain data); every pair is delivered to the GUI thread through the ready signal as soon as it exists
+class RenderSignals(QObject):
+    ready = pyqtSignal(str, object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(bool)  # False when the job was cancelled or failed
+
+
+class RenderWorker(QRunnable):
+    def __init__(self, job):
+        super().__init__()
+        # Created on the GUI thread, so the connected slots run there (queued connections)
+        self.signals = RenderSignals()
+        self.__job = job
+        self.__cancelled = False
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        # Cooperative: the job stops before its next item, a running sympy call is left to finish and discarded
+        self.__cancelled = True
+
+    @property
+    def cancelled(self):
+        return self.__cancelled
+
+    def run(self):
+        completed = False
+        try:
+            for key, payload in self.__job:
+                if self.__cancelled:
+                    break
+                self.signals.ready.emit(key, payload)
+            else:
+                completed = True
+        except Exception as error:
+            if not self.__cancelled:
+                self.signals.failed.emit(str(error))
+        finally:
+            self.__job.close()
+            self.signals.finished.emit(completed and not self.__cancelled)
@@ -1,3 +1,4 @@
+import logging
 from PyQt6.QtWidgets import QGraphicsScene, QGraphicsView, QInputDialog, QMessageBox
 from PyQt6.QtGui import QBrush, QColor , QCursor
 from PyQt6.QtCore import Qt
@@ -6,19 +7,34 @@ from Signal_Flow.gui.Edge import Edge
 from sympy import sympify , SympifyError
 
 
+logger = logging.getLogger(__name__)
+
+
 class Canvas(QGraphicsView):
+    # Fixed BSP depth: the automatic one is recomputed (and the whole index rebuilt) as imported graphs grow
+    BSP_TREE_DEPTH = 10
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.__adj_list = []
+        self.__nodes_by_id = {}  # id -> node, kept in step with __adj_list
         self.__dragged_edge: Edge = None
+        self.__moving_node: Node = None
         self.__delete_mode = False
 
         self.setSceneRect(0, 0, 800, 600)
         self.__scene = QGraphicsScene(self)
+        self.__scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.__scene.setBspTreeDepth(Canvas.BSP_TREE_DEPTH)
         self.setScene(self.__scene)
         self.setBackgroundBrush(QBrush(QColor('white')))
 
+        # Repaint only the bounding rects of the items that changed, painter state is restored by the items themselves
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState)
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
@@ -44,33 +60,27 @@ class Canvas(QGraphicsView):
     """ Node Management"""
 
     def __add_node(self, x, y, id=None):
-        existing_ids = {node.id for node in self.__adj_list}
-
         if id is None:
-            while True:
-                proposed_id = f"X{Node.ID}"
-                if proposed_id not in existing_ids:
-                    id = proposed_id
-                    break
+            while f"X{Node.ID}" in self.__nodes_by_id:
                 Node.ID += 1
+            id = f"X{Node.ID}"
 
         new_node = Node(x=x, y=y, node_id=id)
         self.__adj_list.append(new_node)
+        self.__nodes_by_id[id] = new_node
         self.__scene.addItem(new_node)
         return new_node
 
 
 
     def create_node(self, x, y, text):
-        if self.__adj_list:
-            for node in self.__adj_list:
-                if node.id == text:
-                    return node
-        node = self.__add_node(x, y, text)
+        node = self.__nodes_by_id.get(text)
+        if node is None:
+            node = self.__add_node(x, y, text)
         return node
 
     def create_edge(self, start_node, end_node, gain=1):
-        print(f"Creating edge from {start_node} to {end_node}")
+        logger.debug("Creating edge from %s to %s", start_node, end_node)
         edge = Edge(start_node=start_node, end_node=end_node, weight=gain)
         self.__scene.addItem(edge)
         edge.update_path()
@@ -80,27 +90,30 @@ class Canvas(QGraphicsView):
         for node in self.__adj_list:
             self.__scene.removeItem(node)
         self.__adj_list.clear()
+        self.__nodes_by_id.clear()
         self.__scene.clear()
         self.__add_node(20 , 10 , 'R')
         self.__add_node(1000 , 20 , 'C')
         Node.reset_id()
         self.__dragged_edge = None
+        self.__moving_node = None
 
     def __change_node_pos(self, node : Node, x, y):
+        # Only the edges touching the node are recomputed, setPos / setPath schedule their own repaints
         node.setPos(x - 15, y - 15)
-        for edge in node.inward_edges + node.outward_edges:
+        for edge in node.incident_edges:
             edge.update_path(None)
-            self.__scene.update(edge.boundingRect())
-        self.__scene.update(node.boundingRect())
 
     def __change_node_id(self , node):
         while True:
             new_id, ok = QInputDialog.getText(self, 'Edit Node ID', 'Enter new ID (1 or 2 alphanumeric characters):', text=node.id)
 
             # Check if the user entered a valid new ID
-            is_dup = any(x.id == new_id for x in self.__adj_list if x!=node)
+            is_dup = self.__nodes_by_id.get(new_id, node) is not node
             if ok:
                 if 1 <= len(new_id) <= 2 and new_id.isalnum() and not is_dup:
+                    del self.__nodes_by_id[node.id]
+                    self.__nodes_by_id[new_id] = node
                     node.set_id(new_id)
                     node.update()
                     break  # Exit the loop if valid ID is entered
@@ -168,6 +181,9 @@ class Canvas(QGraphicsView):
 
             self.__scene.removeItem(node)
             self.__adj_list.remove(node)
+            del self.__nodes_by_id[node.id]
+            if node is self.__moving_node:
+                self.__moving_node = None
 
         elif isinstance(graphical_item, Edge):
             edge = graphical_item
@@ -223,6 +239,11 @@ class Canvas(QGraphicsView):
                 self.__add_node(pos.x(), pos.y())
             elif graphical_item is not None and self.__delete_mode:
                 self.__delete_item(graphical_item)
+            else:
+                # Remember the pressed node, moves then go straight to it instead of querying the scene
+                while graphical_item and not isinstance(graphical_item, (Node, Edge)):
+                    graphical_item = graphical_item.parentItem()
+                self.__moving_node = graphical_item if isinstance(graphical_item, Node) else None
 
 
         elif event.button() == Qt.MouseButton.RightButton and graphical_item is not None:
@@ -242,26 +263,15 @@ class Canvas(QGraphicsView):
 
 
     def mouseMoveEvent(self, event):
-        _ , pos = self.__get_mouse_pos_item()
-
-
-        # Check if the mouse is over a node
-        items = self.__scene.items(pos)
-        node = next((
-                item if isinstance(item, Node)
-                else item.parentItem()
-                for item in items
-                if isinstance(item, Node) or (item.parentItem() and isinstance(item.parentItem(), Node))
-            ), None)
+        pos = self.mapToScene(event.position().toPoint())
 
         # Drag Edge in the canvas
         if event.buttons() & Qt.MouseButton.RightButton and self.__dragged_edge:
             self.__dragged_edge.update_path(pos)
-            self.__scene.update(self.__dragged_edge.boundingRect())
 
         # Moves Node in the canvas
-        elif event.buttons() & Qt.MouseButton.LeftButton and isinstance(node, Node):
-            self.__change_node_pos(node, pos.x(), pos.y())
+        elif event.buttons() & Qt.MouseButton.LeftButton and self.__moving_node is not None:
+            self.__change_node_pos(self.__moving_node, pos.x(), pos.y())
 
         super().mouseMoveEvent(event)
 
@@ -269,10 +279,13 @@ class Canvas(QGraphicsView):
 
 
     def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.__moving_node = None
+
         if event.button() == Qt.MouseButton.RightButton and self.__dragged_edge:
             _, pos = self.__get_mouse_pos_item()
 
-            print (len(self.__dragged_edge.start_node.outward_edges))
+            logger.debug("Dropping edge, start node has %d outward edges", len(self.__dragged_edge.start_node.outward_edges))
 
             items = self.__scene.items(pos)
 
@@ -289,7 +302,6 @@ class Canvas(QGraphicsView):
                 self.__dragged_edge.end_node = node
                 node.add_inward_edge(self.__dragged_edge)
                 self.__dragged_edge.update_path(None)
-                self.__scene.update(self.__dragged_edge.boundingRect())
             else:
                 # Remove the edge if no node is found
                 self.__scene.removeItem(self.__dragged_edge)
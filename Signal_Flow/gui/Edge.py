@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsPolygonItem , QGraphicsTextItem
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsPathItem, QGraphicsPolygonItem , QGraphicsTextItem
 from PyQt6.QtGui import QPen, QColor, QPainterPath , QCursor 
 from PyQt6.QtCore import QPointF , Qt , QRectF
 import sympy as sp
@@ -13,10 +13,12 @@ class Edge(QGraphicsPathItem):
         self.__end_node = end_node
         self.__weight = weight
         self.__curve = None
+        self.__geometry = None  # End points the current path was built for
 
         # Set Edge Gain/Weight
         self.__weight_label = QGraphicsTextItem(str(self.__weight), self)
         self.__weight_label.setDefaultTextColor(Qt.GlobalColor.black)
+        self.__weight_label.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         # Register the edge in the nodes
         self.__start_node.add_outward_edge(self)
@@ -47,6 +49,13 @@ class Edge(QGraphicsPathItem):
         if self.__end_pos is None:
             return
 
+        # Nothing to rebuild when neither end moved since the last call
+        geometry = (start_pos.x(), start_pos.y(), self.__end_pos.x(), self.__end_pos.y())
+        if geometry == self.__geometry:
+            return
+        self.__geometry = geometry
+        label_rect = self.__weight_label.boundingRect()
+
         # === SELF-LOOP LOGIC ===
         if self.__end_node == self.__start_node:
             loop_radius = 40
@@ -81,10 +90,7 @@ class Edge(QGraphicsPathItem):
 
             # Label position
             label_offset = QPointF(0, -radius - 2 * loop_radius)
-            label_pos = start_pos + label_offset - QPointF(
-                self.__weight_label.boundingRect().width() / 2,
-                self.__weight_label.boundingRect().height() / 2
-            )
+            label_pos = start_pos + label_offset - QPointF(label_rect.width() / 2, label_rect.height() / 2)
             self.__weight_label.setPos(label_pos)
 
             self.setPath(path)
@@ -138,10 +144,7 @@ class Edge(QGraphicsPathItem):
             normal = QPointF(tangent.y() / length, -tangent.x() / length)
             offset = normal * 20
 
-        label_pos = pt + offset - QPointF(
-            self.__weight_label.boundingRect().width() / 2,
-            self.__weight_label.boundingRect().height() / 2
-        )
+        label_pos = pt + offset - QPointF(label_rect.width() / 2, label_rect.height() / 2)
         self.__weight_label.setPos(label_pos)
 
         path.addPath(arrow_path)
@@ -181,6 +184,10 @@ class Edge(QGraphicsPathItem):
         self.__weight = weight
         self.__weight_label.setPlainText(str(weight))
 
+        # The label size changed, so re-center it
+        self.__geometry = None
+        self.update_path()
+
     @start_node.setter
     def start_node(self , start_node):
         self.__start_node = start_node
@@ -188,6 +195,7 @@ class Edge(QGraphicsPathItem):
     @end_node.setter
     def end_node(self , end_node):
         self.__end_node = end_node
+        self.__geometry = None
 
 
 
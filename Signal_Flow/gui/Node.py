@@ -47,6 +47,10 @@ class Node(QGraphicsEllipseItem):
                       QGraphicsEllipseItem.GraphicsItemFlag.ItemIsSelectable)
         self.setAcceptHoverEvents(True)
 
+        # Drawn once into a device pixmap, moving the node only blits it (the hover pen change refreshes it)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.__node_id.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
 
 
     def set_id(self,node_id):
@@ -66,6 +70,11 @@ class Node(QGraphicsEllipseItem):
     def outward_edges(self):
         return self.__outward_edges
 
+    @property
+    def incident_edges(self):
+        # Inward and outward edges, a self loop only once
+        return list(dict.fromkeys(self.__inward_edges + self.__outward_edges))
+
     @property
     def id(self):
         return self.__node_id.toPlainText()
@@ -1,20 +1,22 @@
+import logging
 from PyQt6.QtWidgets import QMainWindow, QPushButton, QHBoxLayout, QWidget, QToolBar, QLineEdit, QLabel, QVBoxLayout, QApplication, QDialog, QScrollArea, QMessageBox , QFrame
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtGui import QFont, QImage, QPixmap
 from Signal_Flow.gui.Canvas import Canvas
+from LogicalComputation.Compact_Graph import CompactGraph
 from LogicalComputation.Loops_and_Path_Extractor import solver
 from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
 from Signal_Flow.gui.Node import Node
-import matplotlib
-from matplotlib import pyplot as plt
-matplotlib.use("Agg")
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from Shared.gui.Latex_Renderer import render_image
+from Shared.gui.Render_Worker import RenderWorker
 from sympy import Symbol, latex , simplify
-import io
 import re
 import sys
 from sympy import sympify
 
+
+logger = logging.getLogger(__name__)
+
 class SignalFlowGraph(QMainWindow):
     TOOLBAR_HEIGHT = 50
     def __init__(self, parent=None):
@@ -265,9 +267,7 @@ class SignalFlowGraph(QMainWindow):
             
             # gain = ['A', '-3.5']
             # arr = ['X2', 'R']
-            print(arr)
-            print(gain)
-            print(len(arr))
+            logger.debug("Equation %s = %s with gains %s", left_text, arr, gain)
             
             left_node = self.__canvas.create_node(x_offset, y_offset, left_text)
             for i in range(len(arr)):
@@ -300,34 +300,6 @@ class SignalFlowGraph(QMainWindow):
 
 
 #############################################################################
-    def render_to_latex(self , latex_str):
-        fig = plt.figure(figsize=(0.01, 0.01))
-        text = fig.text(
-                0, 0, f"${latex_str}$",
-                fontsize=16,
-                fontfamily="monospace",  # or "sans-serif", "monospace", etc.
-                fontweight="bold",     # optional: "normal", "bold", "light"
-                color="white"
-            )
-        fig.patch.set_alpha(0.0)
-
-        canvas = FigureCanvas(fig)
-        canvas.draw()
-        bbox = text.get_window_extent()
-        width, height = bbox.size
-        width, height = int(width), int(height)
-        fig.set_size_inches(width / fig.dpi, height / fig.dpi)
-        canvas.draw()
-
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", dpi=fig.dpi, bbox_inches='tight', transparent=True, pad_inches=0.05)
-        plt.close(fig)
-
-        pixmap = QPixmap()
-        pixmap.loadFromData(buf.getvalue())
-        return pixmap
-
-
     def __create_title(self,text):
         title = QLabel(text)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -375,146 +347,116 @@ class SignalFlowGraph(QMainWindow):
 
         scroll.setWidget(scroll_content)
 
-        # Extracts paths and loops
-        path_loops_extractor = solver(self.__canvas)
-        path_loops_extractor.extract_paths_and_loops()
-        paths, loops = path_loops_extractor.paths, path_loops_extractor.loops
+        # One title and placeholder per section, results are inserted above the placeholder as they arrive
+        placeholders = {}
+        for section in SOLUTION_SECTIONS:
+            layout.addWidget(self.__create_title(section))
+            placeholder = QLabel("Computing...")
+            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            placeholder.setStyleSheet("color: #8a8a8a; font-style: italic;")
+            layout.addWidget(placeholder)
+            placeholders[section] = placeholder
+            if section != SOLUTION_SECTIONS[-1]:
+                layout.addWidget(self.__create_separator())
 
-        # Computes the deltas and the total transfer func
-        _solver = SignalFlowAnalyzer()
-        main_delta , deltas , non_touching_loops ,total_transfer_func = _solver.solve(loops , paths)
+        layout.addStretch()
 
-        # Title: Paths
-        layout.addWidget(self.__create_title("Paths"))
+        cancel_button = QPushButton("Cancel")
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(solution_dialog.close)
 
-        for i, path in enumerate(paths, 1):
-            node_str = " \\rightarrow ".join(str(n) for n in path["path"])
-            weight_str = latex(path["weight"])  # convert sympy expression or keep as str
-            latex_str = f"\\bullet P_{{{i}}} : {node_str}, \\quad W = {weight_str}"
-            pixmap = self.render_to_latex(latex_str)
-            label = QLabel()
-            label.setPixmap(pixmap)
-            layout.addWidget(label)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(cancel_button)
+        buttons_layout.addWidget(close_button)
+        buttons_layout.addStretch()
 
-        layout.addWidget(self.__create_separator())
+        dialog_layout = QVBoxLayout()
+        dialog_layout.addWidget(scroll)
+        dialog_layout.addLayout(buttons_layout)
 
-        # Title: Loops
-        layout.addWidget(self.__create_title("Loops"))
+        solution_dialog.setLayout(dialog_layout)
 
-        for i, loop in enumerate(loops, 1):
-            node_str = " \\rightarrow ".join(str(n) for n in loop["loop"])
-            weight_str = latex(loop["weight"])
-            latex_str = f"\\bullet L_{{{i}}} : {node_str}, \\quad W = {weight_str}"
-            pixmap = self.render_to_latex(latex_str)
+        def place(section, payload):
             label = QLabel()
-            label.setPixmap(pixmap)
-            layout.addWidget(label)
-
-        layout.addWidget(self.__create_separator())
-
-        # Title: Non-Touching Loops
-        layout.addWidget(self.__create_title("Non-Touching Loops"))
-
-        # Map loop content to their label names
-        # Map each loop to a label like L_{1}, L_{2}, ...
-        loop_labels = {
-            tuple(loop): f"L_{{{idx}}}"
-            for idx, loop in enumerate(_solver.loops_gain.keys(), 1)
-        }
-
-        # Display non-touching loop groups level-wise
-        for level in sorted(non_touching_loops.keys()):
-            groups = non_touching_loops[level]
-            if not groups:
-                continue
-
-            # Create a centered title for this level
-            level_title = QLabel(f"{level + 1} Non-Touching Loops")
-            level_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(level_title)
-
-            for group in groups:
-                if not group:
-                    continue
-
-                try:
-                    # Get LaTeX labels for each loop in the group
-                    label_names = [loop_labels[tuple(loop[1])] for loop in group]
-                except KeyError as e:
-                    print(f"Missing loop key in loop_labels: {e}")
-                    continue
-
-                # Join the labels with spacing
-                joined = " \\quad \\|\\quad ".join(label_names)
-                latex_str = f"\\bullet {joined}"
-
-                # Create and add a label rendered with LaTeX
-                label = QLabel()
+            if section not in ("Paths", "Loops"):
                 label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                label.setPixmap(self.render_to_latex(latex_str))
-                layout.addWidget(label)
-
-
-        layout.addWidget(self.__create_separator())
-
-
-
-        #Title : Deltas
-        layout.addWidget(self.__create_title("Deltas"))
-
-
-        for i, delta in enumerate(deltas, 1):
-            delta_str = f"\\bullet \\Delta_{{{i}}} = {latex(delta)}"
-            label = QLabel()
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            label.setPixmap(self.render_to_latex(delta_str))
-            layout.addWidget(label)
-
-        layout.addWidget(self.__create_separator())
-
-        #Title : Deltas
-        layout.addWidget(self.__create_title("Delta"))
-
-        delta_str = f"\\Delta = {latex(main_delta)}"
-        label = QLabel()
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setPixmap(self.render_to_latex(delta_str))
-        layout.addWidget(label)
-
-        layout.addWidget(self.__create_separator())
-
-
+            if isinstance(payload, QImage):
+                # QPixmap may only be created on the GUI thread, the worker hands over QImages
+                label.setPixmap(QPixmap.fromImage(payload))
+            else:
+                label.setText(payload)
+            layout.insertWidget(layout.indexOf(placeholders[section]), label)
+
+        def done(completed):
+            for placeholder in placeholders.values():
+                if completed:
+                    placeholder.hide()
+                else:
+                    placeholder.setText("Cancelled")
+            cancel_button.setEnabled(False)
+
+        # The canvas is read here, on the GUI thread; the worker only sees the compact graph
+        worker = RenderWorker(_solution_items(CompactGraph.from_canvas(self.__canvas)))
+        worker.signals.ready.connect(place)
+        worker.signals.failed.connect(lambda message: QMessageBox.warning(solution_dialog, "Warning", message))
+        worker.signals.finished.connect(done)
+        cancel_button.clicked.connect(worker.cancel)
+        solution_dialog.finished.connect(worker.cancel)
+        self.__solution_worker = worker
+        worker.start()
 
-        #Transfer func R/C
-        layout.addWidget(self.__create_title("Total Transfer Function"))
+        solution_dialog.exec()
 
-        total_transfer_func = "\\infty" if main_delta ==0 else latex(total_transfer_func)
-        total_transfer_func_str = f"\\frac{{C}}{{R}} = {total_transfer_func}"
-        label = QLabel()
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setPixmap(self.render_to_latex(total_transfer_func_str))
-        layout.addWidget(label)
 
+SOLUTION_SECTIONS = ("Paths", "Loops", "Non-Touching Loops", "Deltas", "Delta", "Total Transfer Function")
 
 
+def _solution_items(graph):
+    # Runs on the worker thread: solves and renders, yielding (section, QImage or level title) in display order
 
+    # Extracts paths and loops
+    path_loops_extractor = solver(graph)
+    path_loops_extractor.extract_paths_and_loops()
+    paths, loops = path_loops_extractor.paths, path_loops_extractor.loops
 
+    for i, path in enumerate(paths, 1):
+        node_str = " \\rightarrow ".join(str(n) for n in path["path"])
+        weight_str = latex(path["weight"])  # convert sympy expression or keep as str
+        yield "Paths", render_image(f"\\bullet P_{{{i}}} : {node_str}, \\quad W = {weight_str}")
 
-        layout.addStretch()
-
-        close_button = QPushButton("Close")
-        close_button.clicked.connect(solution_dialog.close)
-        layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
+    for i, loop in enumerate(loops, 1):
+        node_str = " \\rightarrow ".join(str(n) for n in loop["loop"])
+        weight_str = latex(loop["weight"])
+        yield "Loops", render_image(f"\\bullet L_{{{i}}} : {node_str}, \\quad W = {weight_str}")
 
-        dialog_layout = QVBoxLayout()
-        dialog_layout.addWidget(scroll)
-        dialog_layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
+    # Computes the deltas and the total transfer func
+    _solver = SignalFlowAnalyzer()
+    main_delta , deltas , non_touching_loops ,total_transfer_func = _solver.solve(loops , paths)
 
-        solution_dialog.setLayout(dialog_layout)
+    # Map each loop to a label like L_{1}, L_{2}, ...
+    loop_labels = {
+        tuple(loop): f"L_{{{idx}}}"
+        for idx, loop in enumerate(_solver.loops_gain.keys(), 1)
+    }
 
-        solution_dialog.exec()
+    # Display non-touching loop groups level-wise
+    for level in sorted(non_touching_loops.keys()):
+        groups = [group for group in non_touching_loops[level] if group]
+        if not groups:
+            continue
 
+        yield "Non-Touching Loops", f"{level + 1} Non-Touching Loops"
 
+        for group in groups:
+            # Every group is a list of loops (node lists)
+            joined = " \\quad \\|\\quad ".join(loop_labels[tuple(loop)] for loop in group)
+            yield "Non-Touching Loops", render_image(f"\\bullet {joined}")
 
+    for i, delta in enumerate(deltas, 1):
+        yield "Deltas", render_image(f"\\bullet \\Delta_{{{i}}} = {latex(delta)}")
 
+    yield "Delta", render_image(f"\\Delta = {latex(main_delta)}")
 
+    total_transfer_func = "\\infty" if main_delta ==0 else latex(total_transfer_func)
+    yield "Total Transfer Function", render_image(f"\\frac{{C}}{{R}} = {total_transfer_func}")
@@ -0,0 +1,237 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+
+
+# Timing harness for the extractor, the Mason analyzer and the Routh solver.
+#   python -m tester.benchmark                 compare against the stored baseline, exit 1 on a regression
+#   python -m tester.benchmark --save          record a new baseline
+#   python -m tester.benchmark -k mason        only the cases whose name contains "mason"
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+# Graph generators, {source: {target: gain}} dicts for CompactGraph.from_dict
+def ladder_graph(stages):
+    # Chain of stages with a feedback edge around every stage
+    adjacency = {'R': {'X0': 'g'}}
+    for i in range(stages - 1):
+        adjacency.setdefault(f'X{i}', {})[f'X{i + 1}'] = f'g{i}'
+        adjacency.setdefault(f'X{i + 1}', {})[f'X{i}'] = f'-h{i}'
+    adjacency[f'X{stages - 1}']['C'] = 'k'
+    return adjacency
+
+
+def clique_graph(size):
+    # Every inner node feeds every other one: the loop count grows factorially
+    inner = [f'X{i}' for i in range(size)]
+    adjacency = {'R': {inner[0]: 'g'}}
+    for i, source in enumerate(inner):
+        adjacency[source] = {target: f'a{i}_{j}' for j, target in enumerate(inner) if i != j}
+    adjacency[inner[-1]]['C'] = 'k'
+    return adjacency
+
+
+def random_sparse_graph(size, degree=2, seed=0):
+    # Forward chain (so the output is reachable) plus degree - 1 random edges per node
+    generator = random.Random(seed)
+    inner = [f'X{i}' for i in range(size)]
+    adjacency = {'R': {inner[0]: 'g'}}
+    for i, source in enumerate(inner):
+        adjacency[source] = {inner[i + 1]: f'f{i}'} if i + 1 < size else {'C': 'k'}
+        for _ in range(degree - 1):
+            target = generator.choice(inner)
+            adjacency[source].setdefault(target, f'a{i}_{inner.index(target)}')
+    return adjacency
+
+
+def nested_feedback_graph(depth):
+    # Feedback loops nested inside each other: X(2d - i) -> X(i) for every level i
+    length = 2 * depth
+    adjacency = {'R': {'X0': 'g'}}
+    for i in range(length):
+        adjacency[f'X{i}'] = {f'X{i + 1}': f'f{i}'}
+    adjacency[f'X{length}'] = {'C': 'k'}
+    for level in range(depth):
+        adjacency[f'X{length - level}'][f'X{level}'] = f'-h{level}'
+    return adjacency
+
+
+def routh_polynomial(order, unstable=0, seed=0):
+    # Real coefficients from random roots, the first `unstable` of them in the right half plane
+    generator = np.random.default_rng(seed)
+    roots = []
+    while len(roots) < order:
+        in_rhp = len(roots) < unstable
+        real = generator.uniform(0.1, 3) * (1 if in_rhp else -1)
+        # A conjugate pair never straddles the imaginary axis
+        pair_fits = len(roots) + 2 <= (unstable if in_rhp else order)
+        if pair_fits and generator.random() < 0.5:
+            imag = generator.uniform(0.1, 3)
+            roots += [complex(real, imag), complex(real, -imag)]
+        else:
+            roots.append(real)
+    return [round(float(value), 6) for value in np.real(np.poly(roots))]
+
+
+# Graph families: name -> (generator, sizes for each timed stage)
+GRAPHS = {
+    'ladder': (ladder_graph, {'extract': (20, 80, 320), 'mason': (8, 12, 16)}),
+    'clique': (clique_graph, {'extract': (5, 6, 7), 'mason': (4, 5, 6)}),
+    'random_sparse': (random_sparse_graph, {'extract': (16, 24, 32), 'mason': (10, 14, 18)}),
+    'nested_feedback': (nested_feedback_graph, {'extract': (10, 40, 160), 'mason': (4, 8, 16)}),
+}
+ROUTH_ORDERS = (4, 8, 16, 32)
+
+
+def _extract(adjacency):
+    extractor = solver(CompactGraph.from_dict(adjacency))
+    extractor.extract_paths_and_loops()
+    return extractor
+
+
+def _mason(extractor):
+    SignalFlowAnalyzer().solve(extractor.loops, extractor.paths)
+
+
+def cases():
+    # (name, setup, timed function): setup builds the input outside of the timed region
+    for family, (generator, stages) in GRAPHS.items():
+        for size in stages['extract']:
+            yield f'extract[{family}-{size}]', lambda g=generator, n=size: g(n), _extract
+        for size in stages['mason']:
+            yield f'mason[{family}-{size}]', lambda g=generator, n=size: _extract(g(n)), _mason
+    for order in ROUTH_ORDERS:
+        for unstable in (0, 2):
+            yield (
+                f'routh[order-{order}-rhp-{unstable}]',
+                lambda n=order, u=unstable: routh_polynomial(n, u),
+                lambda coeffs: RouthStabilitySolver(coeffs).solve()
+            )
+
+
+def measure(setup, function, repeat=7, budget=2.0, min_time=0.05):
+    # Best and median per call time of up to `repeat` samples, stopping early once `budget` seconds were spent.
+    # An untimed warm-up call sizes the samples: fast cases are looped until one sample takes `min_time`,
+    # so timer resolution and scheduler hiccups are spread over many calls
+    argument = setup()
+    begin = time.perf_counter()
+    function(argument)
+    loops = max(1, math.ceil(min_time / max(time.perf_counter() - begin, 1e-9)))
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat and (not timings or time.perf_counter() - started < budget):
+        begin = time.perf_counter()
+        for _ in range(loops):
+            function(argument)
+        timings.append((time.perf_counter() - begin) / loops)
+    return {'min': min(timings), 'median': statistics.median(timings), 'runs': len(timings), 'loops': loops}
+
+
+def calibrate(repeat=7):
+    # A fixed pure Python workload timed next to the cases. Its ratio to the recorded value scales the baseline,
+    # so a machine that is slower or busier as a whole does not read as a regression
+    def workload(_):
+        total = Fraction(0)
+        for i in range(1, 2000):
+            total += Fraction(i % 7, i)
+        return sum(i * i for i in range(100000)), total
+    return measure(lambda: None, workload, repeat)['min']
+
+
+def run(pattern=None, repeat=7, report=None):
+    results = {}
+    for name, setup, function in cases():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(setup, function, repeat)
+        if report:
+            report(name, results[name])
+    return results
+
+
+def merge_passes(passes):
+    # Best time over several recording passes, plus the spread between them as the case's noise allowance
+    merged = {}
+    for name in passes[0]:
+        minima = [results[name]['min'] for results in passes]
+        merged[name] = dict(min(passes, key=lambda results: results[name]['min'])[name])
+        merged[name]['noise'] = max(minima) / min(minima) - 1
+    return merged
+
+
+def compare(results, baseline, threshold=1.3, floor=2e-3, scale=1.0):
+    # Regressions: cases whose best time grew by more than `threshold` times, widened by the noise recorded
+    # with the baseline, and by at least `floor` seconds. `scale` is the machine speed ratio from calibrate()
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['min'] * scale, timing['min']
+        allowance = threshold * (1 + baseline[name].get('noise', 0.0))
+        if after > before * allowance and after - before > floor:
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the signal flow graph and Routh solvers.")
+    parser.add_argument('-k', dest='pattern', help="only run cases whose name contains this text")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON file")
+    parser.add_argument('--repeat', type=int, default=7, help="samples per case (best time is compared)")
+    parser.add_argument('--passes', type=int, default=3, help="recording passes with --save, their spread is the noise allowance")
+    parser.add_argument('--threshold', type=float, default=1.3, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args(argv)
+
+    baseline, recorded_calibration = {}, None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            document = json.load(file)
+        baseline, recorded_calibration = document['results'], document.get('calibration')
+
+    calibration = calibrate()
+    scale = calibration / recorded_calibration if recorded_calibration and not args.save else 1.0
+    print(f"{'machine speed against the baseline':40s} {scale:10.2f}x")
+
+    def report(name, timing):
+        previous = baseline.get(name)
+        change = f"{timing['min'] / (previous['min'] * scale):6.2f}x" if previous else "   new"
+        print(f"{name:40s} {timing['min'] * 1e3:10.3f} ms  {change}")
+
+    results = run(args.pattern, args.repeat, report)
+
+    if args.save:
+        passes = [results] + [run(args.pattern, args.repeat) for _ in range(args.passes - 1)]
+        results = merge_passes(passes)
+        if args.pattern:
+            results = {**baseline, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                       'calibration': calibration, 'results': results},
+                      file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, scale=scale)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before * 1e3:.2f} ms -> {after * 1e3:.2f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
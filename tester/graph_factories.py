@@ -0,0 +1,18 @@
+import random
+
+from LogicalComputation.Compact_Graph import CompactGraph
+
+
+# Graph builders shared by the test modules
+def random_graph(seed, size=10, density=0.35):
+    # Three entry nodes after R, three exit nodes into C and random edges (self loops included) in between
+    generator = random.Random(seed)
+    inner = [f'X{i}' for i in range(size)]
+    adjacency = {'R': {name: f'g{i}' for i, name in enumerate(inner[:3])}}
+    for i, source in enumerate(inner):
+        adjacency[source] = {
+            target: f'a{i}_{j}' for j, target in enumerate(inner) if generator.random() < density
+        }
+    for name in inner[-3:]:
+        adjacency[name]['C'] = 1
+    return CompactGraph.from_dict(adjacency)
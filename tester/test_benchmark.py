@@ -0,0 +1,44 @@
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+from tester import benchmark
+
+
+def test_graph_generators_build_solvable_graphs():
+    for generator, _ in benchmark.GRAPHS.values():
+        extractor = solver(CompactGraph.from_dict(generator(4)))
+        extractor.extract_paths_and_loops()
+        assert extractor.paths and extractor.loops
+
+
+def test_routh_polynomial_has_requested_rhp_roots():
+    for order in (3, 6):
+        for unstable in (0, 2):
+            sign_changes, _, _, _ = RouthStabilitySolver(benchmark.routh_polynomial(order, unstable)).solve()
+            assert sign_changes == unstable
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {'a': {'min': 0.010}, 'b': {'min': 0.010}, 'c': {'min': 0.0001}}
+    results = {'a': {'min': 0.011}, 'b': {'min': 0.020}, 'c': {'min': 0.0005}, 'new': {'min': 1.0}}
+    assert benchmark.compare(results, baseline) == [('b', 0.010, 0.020)]
+
+
+def test_compare_allows_recorded_noise_and_machine_speed():
+    baseline = {'a': {'min': 0.010, 'noise': 0.5}, 'b': {'min': 0.010}}
+    results = {'a': {'min': 0.018}, 'b': {'min': 0.018}}
+    assert benchmark.compare(results, baseline) == [('b', 0.010, 0.018)]
+    assert benchmark.compare(results, baseline, scale=1.5) == []
+
+
+def test_merge_passes_keeps_best_time_and_spread():
+    passes = [{'a': {'min': 0.012, 'runs': 7}}, {'a': {'min': 0.010, 'runs': 7}}, {'a': {'min': 0.011, 'runs': 7}}]
+    merged = benchmark.merge_passes(passes)
+    assert merged['a']['min'] == 0.010
+    assert abs(merged['a']['noise'] - 0.2) < 1e-9
+
+
+def test_run_filters_cases():
+    results = benchmark.run('routh[order-4-', repeat=1)
+    assert sorted(results) == ['routh[order-4-rhp-0]', 'routh[order-4-rhp-2]']
+    assert all(timing['runs'] == 1 for timing in results.values())
@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+from sympy import symbols
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+
+
+def test_csr_layout_from_dict():
+    graph = CompactGraph.from_dict({
+        'R': {'A': 'x'},
+        'A': [('B', 2), ('C', 3)],
+        'B': {'A': -1, 'C': 1},
+    })
+    x = symbols('x')
+
+    assert graph.node_ids == ('R', 'A', 'B', 'C')
+    assert graph.offsets == (0, 1, 3, 5, 5)
+    assert graph.targets == (1, 2, 3, 1, 3)
+    assert graph.weights[0] == x
+    assert [graph.in_degree(node) for node in range(4)] == [0, 2, 1, 2]
+    assert graph.mask([1, 3]) == 0b1010
+
+    with pytest.raises(AttributeError):
+        graph.node_ids = ()
+
+    copy = pickle.loads(pickle.dumps(graph))
+    assert copy.targets == graph.targets and copy.index_of('C') == 3
+
+
+def test_headless_solve_from_dict():
+    x, y = symbols('x y')
+    graph = CompactGraph.from_dict({
+        'R': {'A': x},
+        'A': {'B': 3, 'C': 6},
+        'B': {'C': 2, 'A': -y},
+        'C': {'B': 4, 'out': 1, 'A': y},
+    })
+
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+    delta, _, _, result = SignalFlowAnalyzer().solve(extractor.loops, extractor.paths)
+
+    assert [path['path'] for path in extractor.paths] == [['R', 'A', 'B', 'C', 'out'], ['R', 'A', 'C', 'out']]
+    assert (delta - (15 * y - 7)).expand() == 0
+    assert (result - 12 * x / (15 * y - 7)).simplify() == 0
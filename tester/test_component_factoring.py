@@ -0,0 +1,76 @@
+import random
+
+from sympy import Rational, expand
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from tester.graph_factories import random_graph
+
+
+def block_diagonal_graph():
+    # Three feedback blocks in series, joined by acyclic feed-forward edges
+    adjacency = {'R': {'A1': 'g0', 'B1': 'f0'}}
+    for block, gain in (('A', 'a'), ('B', 'b'), ('D', 'd')):
+        adjacency[f'{block}1'] = {f'{block}2': f'{gain}1', f'{block}3': f'{gain}2'}
+        adjacency[f'{block}2'] = {f'{block}1': f'-{gain}3', f'{block}3': f'{gain}4'}
+        adjacency[f'{block}3'] = {f'{block}1': f'-{gain}5', f'{block}2': f'-{gain}6'}
+    adjacency['A3']['B1'] = 'g1'
+    adjacency['A2']['D1'] = 'f1'
+    adjacency['B3']['D1'] = 'g2'
+    adjacency['D3']['C'] = 'g3'
+    return CompactGraph.from_dict(adjacency)
+
+
+def test_components_follow_cycles():
+    graph = block_diagonal_graph()
+    component = graph.strongly_connected_components()
+
+    blocks = {block: {component[graph.index_of(f'{block}{i}')] for i in (1, 2, 3)} for block in 'ABD'}
+    assert all(len(ids) == 1 for ids in blocks.values())
+    assert len(set.union(*blocks.values())) == 3
+    assert len({component[graph.index_of(node)] for node in ('R', 'C')}) == 2
+    # Reverse topological order: the output's component completes first
+    assert component[graph.index_of('C')] < component[graph.index_of('D1')] < component[graph.index_of('A1')]
+
+
+def test_loops_stay_inside_components():
+    graph = block_diagonal_graph()
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+
+    component = graph.strongly_connected_components()
+    assert len(extractor.loops) == 15  # Five loops in each fully connected block of three
+    for loop in extractor.loops:
+        assert len({component[graph.index_of(node)] for node in loop['loop']}) == 1
+
+
+def test_factored_delta_matches_expanded():
+    for graph in (block_diagonal_graph(), random_graph(3, size=8)):
+        extractor = solver(graph)
+        extractor.extract_paths_and_loops()
+        loops, paths = extractor.loops, extractor.paths
+
+        delta, deltas, _, result = SignalFlowAnalyzer().solve(loops, paths)
+        factored_analyzer = SignalFlowAnalyzer(factor_components=True)
+        factored_delta, factored_deltas, _, factored_result = factored_analyzer.solve(loops, paths)
+
+        assert expand(factored_delta - delta) == 0
+        assert all(expand(a - b) == 0 for a, b in zip(factored_deltas, deltas))
+        generator = random.Random(1)
+        point = {symbol: Rational(generator.randint(1, 9), generator.randint(2, 9)) for symbol in result.free_symbols}
+        assert (factored_result - result).subs(point) == 0
+
+
+def test_factored_reports_combinations_inside_groups():
+    extractor = solver(block_diagonal_graph())
+    extractor.extract_paths_and_loops()
+    loops, paths = extractor.loops, extractor.paths
+
+    _, _, combined, _ = SignalFlowAnalyzer().solve(loops, paths)
+    _, _, factored, _ = SignalFlowAnalyzer(factor_components=True).solve(loops, paths)
+
+    # Each block's three loops all share a node, so no pair inside a block is non-touching
+    assert sorted(factored[0]) == sorted(combined[0])
+    assert factored[1] == []
+    assert len(combined[1]) == 3 * 5 * 5 and len(combined[2]) == 5 ** 3
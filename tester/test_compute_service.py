@@ -0,0 +1,65 @@
+import json
+
+from ComputeService import handle_request, serve
+
+
+def test_graph_request():
+    response = handle_request({
+        "request_id": "sfg",
+        "graph": {"R": {"X1": "G1"}, "X1": {"X1": "-H", "C": "G2"}},
+    })
+
+    assert response["request_id"] == "sfg"
+    assert response["paths"] == [{"path": ["R", "X1", "C"], "weight": "G1*G2"}]
+    assert response["loops"] == [{"loop": ["X1", "X1"], "weight": "-H"}]
+    assert response["transfer_function"] == "G1*G2/(H + 1)"
+    assert "stats" not in response
+
+
+def test_stats_on_request():
+    response = handle_request({"graph": {"R": {"X1": "G1"}, "X1": {"X1": "-H", "C": "G2"}}, "stats": True})
+
+    assert response["stats"]["counts"]["loops"] == 1
+    assert {"paths", "loops", "delta", "division"} <= set(response["stats"]["stages"])
+    json.dumps(response)
+
+
+def test_routh_request():
+    response = handle_request({"request_id": 7, "coeffs": [1, 6, 11, 6]})
+
+    assert response == {
+        "request_id": 7,
+        "characteristic_equation": "s^{3} + 6 s^{2} + 11 s + 6=0",
+        "sign_changes": 0,
+        "stable": True,
+        "rhp_roots": [],
+    }
+
+
+def test_imaginary_axis_roots_are_not_stable():
+    # s^2 + 1: roots at ±i, no sign changes
+    response = handle_request({"coeffs": [1, 0, 1]})
+
+    assert response["sign_changes"] == 0
+    assert response["stable"] is False
+    assert response["rhp_roots"] == []
+
+
+def test_stream_keeps_order_and_reports_bad_lines():
+    lines = [
+        json.dumps({"request_id": "a", "coeffs": [1, -1]}),
+        "",
+        "{broken",
+        json.dumps({"request_id": "b", "title": "no payload"}),
+        json.dumps({"request_id": "c", "graph": {"R": {"C": "k"}}}),
+    ]
+
+    inline = list(serve(lines, workers=0))
+    pooled = list(serve(lines, workers=2))
+
+    assert inline == pooled
+    assert [response["request_id"] for response in inline] == ["a", None, "b", "c"]
+    assert inline[0]["sign_changes"] == 1
+    assert inline[1]["error"].startswith("JSONDecodeError")
+    assert "Unsupported request" in inline[2]["error"]
+    assert inline[3]["transfer_function"] == "k"
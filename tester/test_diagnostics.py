@@ -0,0 +1,59 @@
+import logging
+
+from sympy import symbols
+
+from LogicalComputation.Diagnostics import dump_expression, dump_expressions
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+
+
+class CountingStr:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "expensive"
+
+
+def single_loop():
+    g, h = symbols('g h')
+    loops = [{'loop': ['X1', 'X1'], 'weight': -h}]
+    paths = [{'path': ['R', 'X1', 'C'], 'weight': g}]
+    return loops, paths
+
+
+def test_solve_is_silent_and_logs_on_debug(capsys, caplog):
+    SignalFlowAnalyzer().solve(*single_loop())
+    assert capsys.readouterr().out == ""
+
+    with caplog.at_level(logging.DEBUG, logger='LogicalComputation'):
+        SignalFlowAnalyzer().solve(*single_loop())
+    messages = [record.getMessage() for record in caplog.records]
+    assert "delta: h + 1" in messages and "result: g/(h + 1)" in messages
+
+
+def test_disabled_level_never_builds_strings():
+    value = CountingStr()
+    logger = logging.getLogger('LogicalComputation.Signal_Flow_Graph_Solver')
+    logger.debug("num: %s", value)
+    assert dump_expression('value', value) is None
+    assert value.calls == 0
+
+
+def test_expressions_dumped_to_disk(tmp_path):
+    dump_expressions(str(tmp_path))
+    try:
+        SignalFlowAnalyzer().solve(*single_loop())
+    finally:
+        dump_expressions(None)
+
+    written = {path.name.split('_', 2)[2]: path.read_text(encoding='utf-8') for path in tmp_path.iterdir()}
+    assert written == {'numerator.txt': 'g', 'delta.txt': 'h + 1', 'result.txt': 'g/(h + 1)'}
+
+
+def test_routh_order_error_is_logged(capsys, caplog):
+    with caplog.at_level(logging.ERROR):
+        assert RouthStabilitySolver([5]).solve() is None
+    assert capsys.readouterr().out == ""
+    assert "order of at least 1" in caplog.text
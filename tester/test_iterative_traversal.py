@@ -0,0 +1,29 @@
+import sys
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+
+
+def ladder(stages):
+    # R -> X0 -> ... -> X(n-1) -> C with a feedback edge around every stage and a long outer loop
+    adjacency = {"R": {"X0": "1"}}
+    for i in range(stages - 1):
+        adjacency.setdefault(f"X{i}", {})[f"X{i + 1}"] = "G"
+        adjacency.setdefault(f"X{i + 1}", {})[f"X{i}"] = "-H"
+    adjacency[f"X{stages - 1}"]["C"] = "1"
+    adjacency[f"X{stages - 1}"]["X0"] = "-K"
+    return CompactGraph.from_dict(adjacency)
+
+
+def test_deep_ladder_beyond_recursion_limit():
+    stages = sys.getrecursionlimit() + 500
+    extractor = solver(ladder(stages))
+    extractor.extract_paths_and_loops()
+
+    assert len(extractor.paths) == 1
+    assert len(extractor.paths[0]["path"]) == stages + 2
+
+    # stages - 1 feedback loops plus the loop through every stage
+    loops = extractor.loops
+    assert len(loops) == stages
+    assert max(len(loop["loop"]) for loop in loops) == stages + 1
@@ -0,0 +1,76 @@
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from sympy import symbols
+
+
+class MockEdge:
+    def __init__(self, source, target, weight):
+        self.source = source
+        self.target = target
+        self.end_node = target
+        self.weight = weight
+
+
+class MockNode:
+    def __init__(self, node_id):
+        self.id = node_id
+        self.outward_edges = []
+        self.inward_edges = []
+
+    def add_edge(self, neighbor, weight):
+        edge = MockEdge(self, neighbor, weight)
+        self.outward_edges.append(edge)
+        neighbor.inward_edges.append(edge)
+
+
+def build_solver(nodes):
+    class MockCanvas:
+        @property
+        def adj_list(self):
+            return nodes
+
+    solver_instance = solver(MockCanvas())
+    solver_instance.extract_paths_and_loops()
+    return solver_instance
+
+
+def test_complete_graph_loops_found_once():
+    node_R = MockNode('R')
+    inner = [MockNode(f'X{i}') for i in range(4)]
+    node_C = MockNode('C')
+
+    node_R.add_edge(inner[0], 1)
+    inner[-1].add_edge(node_C, 1)
+    for a in inner:
+        for b in inner:
+            if a is not b:
+                a.add_edge(b, 1)
+
+    loops = build_solver([node_R, *inner, node_C]).loops
+    rotations = {tuple(sorted(loop['loop'][:-1])) + (len(loop['loop']),) for loop in loops}
+
+    # 6 two-node loops, 8 three-node loops and 6 four-node loops
+    assert len(loops) == 20
+    assert all(loop['loop'][0] == loop['loop'][-1] for loop in loops)
+    assert len({tuple(loop['loop']) for loop in loops}) == 20
+    assert len(rotations) == 6 + 4 + 1
+
+
+def test_parallel_edges_merge_into_one_loop():
+    node_R = MockNode('R')
+    node_A = MockNode('A')
+    node_B = MockNode('B')
+    node_C = MockNode('C')
+    x, y = symbols('x y')
+
+    node_R.add_edge(node_A, 1)
+    node_A.add_edge(node_B, x)
+    node_A.add_edge(node_B, y)
+    node_B.add_edge(node_A, 2)
+    node_B.add_edge(node_B, 3)
+    node_B.add_edge(node_C, 1)
+
+    loops = build_solver([node_R, node_A, node_B, node_C]).loops
+
+    assert [loop['loop'] for loop in loops] == [['A', 'B', 'A'], ['B', 'B']]
+    assert (loops[0]['weight'] - 2 * (x + y)).expand() == 0
+    assert loops[1]['weight'] == 3
@@ -0,0 +1,56 @@
+import numpy as np
+from sympy import cancel, expand, symbols
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Linear_System_Solver import LinearSystemSolver
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from tester.graph_factories import random_graph
+
+
+def mason(graph):
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+    delta, _, _, result = SignalFlowAnalyzer().solve(extractor.loops, extractor.paths)
+    return delta, result
+
+
+def test_determinant_matches_mason():
+    graph = random_graph(3, size=8)
+    delta, result = mason(graph)
+    linear_delta, linear_result = LinearSystemSolver(graph).solve()
+
+    assert expand(linear_delta - delta) == 0
+    assert cancel(linear_result - result) == 0
+
+
+def test_parallel_edges_and_rational_gains():
+    s, k = symbols('s k')
+    graph = CompactGraph.from_dict({
+        'R': [('X1', 1), ('X1', k)],
+        'X1': [('X2', k / (s + 1)), ('X3', 2)],
+        'X2': [('X3', 1 / s), ('X1', -1), ('X1', -s)],
+        'X3': [('X2', -s), ('C', 1), ('X1', -k)],
+    })
+    _, result = mason(graph)
+    engine = LinearSystemSolver(graph)
+    _, linear_result = engine.solve()
+
+    assert cancel(linear_result - result) == 0
+    assert engine.cross_check(result)
+    assert not engine.cross_check(result * 1.001)
+
+
+def test_numeric_lu_matches_mason_evaluation():
+    graph = random_graph(5, size=8)
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+    variables = sorted({symbol for record in extractor.loops + extractor.paths for symbol in record['weight'].free_symbols}, key=str)
+
+    generator = np.random.default_rng(2)
+    points = {variable: generator.uniform(-1, 1, 16) for variable in variables}
+    delta, _, result = SignalFlowAnalyzer().evaluate(extractor.loops, extractor.paths, points)
+    linear_delta, linear_result = LinearSystemSolver(graph).evaluate(points)
+
+    assert np.allclose(linear_delta, delta)
+    assert np.allclose(linear_result, result)
@@ -0,0 +1,77 @@
+import random
+from itertools import combinations
+
+from sympy import Integer, symbols
+
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+
+
+def brute_force_levels(loops):
+    levels = {}
+    for size in range(1, len(loops) + 1):
+        found = [
+            combo for combo in combinations(range(len(loops)), size)
+            if all(set(loops[a]).isdisjoint(loops[b]) for a, b in combinations(combo, 2))
+        ]
+        if not found:
+            break
+        levels[size - 1] = found
+    return levels
+
+
+def test_combinations_match_brute_force():
+    generator = random.Random(7)
+    nodes = [f'X{i}' for i in range(12)]
+    loop_nodes = []
+    while len(loop_nodes) < 18:
+        members = generator.sample(nodes, generator.randint(1, 4))
+        if members not in loop_nodes:
+            loop_nodes.append(members)
+
+    loops = [{'loop': members + [members[0]], 'weight': Integer(i + 2)} for i, members in enumerate(loop_nodes)]
+    paths = [{'path': ['R', 'C'], 'weight': Integer(1)}]
+
+    _, _, untouching_loops, _ = SignalFlowAnalyzer().solve(loops, paths)
+    expected = brute_force_levels(loop_nodes)
+
+    assert untouching_loops[len(expected)] == []
+    for level, combos in expected.items():
+        assert untouching_loops[level] == [[loops[i]['loop'] for i in combo] for combo in combos]
+
+
+def test_three_disjoint_loops_delta():
+    a, b, c = symbols('a b c')
+    loops = [
+        {'loop': ['A', 'B', 'A'], 'weight': a},
+        {'loop': ['C', 'D', 'C'], 'weight': b},
+        {'loop': ['E', 'F', 'E'], 'weight': c},
+    ]
+    paths = [{'path': ['R', 'A', 'B', 'C', 'D', 'E', 'F', 'Y'], 'weight': Integer(1)}]
+
+    analyzer = SignalFlowAnalyzer()
+    delta, deltas, untouching_loops, _ = analyzer.solve(loops, paths)
+
+    assert [len(untouching_loops[level]) for level in range(4)] == [3, 3, 1, 0]
+    assert analyzer.untouching_loops_number == 3
+    assert (delta - (1 - a) * (1 - b) * (1 - c)).expand() == 0
+    assert deltas == [1]
+
+
+def test_path_deltas_keep_only_disjoint_combinations():
+    a, b, c = symbols('a b c')
+    loops = [
+        {'loop': ['A', 'B', 'A'], 'weight': a},
+        {'loop': ['C', 'D', 'C'], 'weight': b},
+        {'loop': ['E', 'F', 'E'], 'weight': c},
+    ]
+    paths = [
+        {'path': ['R', 'A', 'B', 'Y'], 'weight': Integer(2)},
+        {'path': ['R', 'C', 'Y'], 'weight': Integer(3)},
+    ]
+
+    _, deltas, _, result = SignalFlowAnalyzer().solve(loops, paths)
+
+    assert (deltas[0] - (1 - b) * (1 - c)).expand() == 0
+    assert (deltas[1] - (1 - a) * (1 - c)).expand() == 0
+    expected = (2 * (1 - b) * (1 - c) + 3 * (1 - a) * (1 - c)) / ((1 - a) * (1 - b) * (1 - c))
+    assert (result - expected).simplify() == 0
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sympy import lambdify, symbols
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+
+
+def extract(adjacency):
+    extractor = solver(CompactGraph.from_dict(adjacency))
+    extractor.extract_paths_and_loops()
+    return extractor.loops, extractor.paths
+
+
+def test_numeric_matches_symbolic_over_frequency_grid():
+    s, k = symbols('s k')
+    loops, paths = extract({
+        'R': {'X1': 1},
+        'X1': {'X2': k / (s + 1), 'X3': 2},
+        'X2': {'X3': 1 / s, 'X1': -1},
+        'X3': {'X2': -s, 'C': 1, 'X1': -k},
+    })
+
+    delta, deltas, _, result = SignalFlowAnalyzer().solve(loops, paths)
+
+    omega = np.logspace(-2, 2, 200)
+    numeric_delta, numeric_deltas, numeric_result = SignalFlowAnalyzer().evaluate(
+        loops, paths, {'s': 1j * omega, k: 3.0}
+    )
+
+    expected = lambdify(s, result.subs(k, 3), 'numpy')(1j * omega)
+    assert numeric_result.shape == omega.shape
+    assert np.allclose(numeric_result, expected)
+    assert np.allclose(numeric_delta, lambdify(s, delta.subs(k, 3), 'numpy')(1j * omega))
+    assert len(numeric_deltas) == len(deltas)
+
+
+def test_missing_symbol_values_are_reported():
+    s, k = symbols('s k')
+    loops, paths = extract({'R': {'A': k}, 'A': {'B': s}, 'B': {'A': -1, 'C': 1}})
+
+    with pytest.raises(ValueError, match='k'):
+        SignalFlowAnalyzer().evaluate(loops, paths, {s: [1, 2]})
@@ -0,0 +1,39 @@
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from tester.graph_factories import random_graph
+
+
+def test_parallel_matches_serial():
+    graph = random_graph(11)
+
+    serial = solver(graph)
+    serial.extract_paths_and_loops()
+    parallel = solver(graph)
+    parallel.extract_paths_and_loops(workers=3)
+
+    assert len(serial.loops) > 50 and len(serial.paths) > 50
+    assert parallel.paths == serial.paths
+    assert parallel.loops == serial.loops
+
+
+def test_shards_cover_every_loop_once():
+    graph = random_graph(5, size=8)
+    extractor = solver(graph)
+
+    shards = [extractor.search_loops([node]) for node in range(graph.node_count)]
+
+    assert sorted(record for shard in shards for record in shard) == sorted(extractor.search_loops())
+
+
+def test_parallel_mason_sums_match_serial():
+    extractor = solver(random_graph(2, size=7, density=0.3))
+    extractor.extract_paths_and_loops()
+    loops, paths = extractor.loops, extractor.paths
+
+    serial = SignalFlowAnalyzer().solve(loops, paths)
+    parallel = SignalFlowAnalyzer(workers=2).solve(loops, paths)
+
+    assert len(serial[2][1]) > 0
+    assert parallel[0] == serial[0]
+    assert parallel[1] == serial[1]
+    assert parallel[3] == serial[3]
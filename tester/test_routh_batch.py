@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+
+
+def test_screen_matches_single_polynomial_solver():
+    generator = np.random.default_rng(3)
+    coeffs = generator.integers(-4, 8, size=(200, 6))
+    coeffs[:, 0] = generator.integers(1, 4, size=200)
+
+    sign_changes, stable = RouthStabilitySolver.screen(coeffs)
+
+    expected = [RouthStabilitySolver(row.tolist()).count_sign_changes() for row in coeffs]
+    assert sign_changes.tolist() == expected
+    assert stable.tolist() == [RouthStabilitySolver(row.tolist()).is_stable() for row in coeffs]
+
+
+def test_screen_classifies_known_roots():
+    generator = np.random.default_rng(4)
+    left_roots = -generator.uniform(0.1, 5, size=(500, 7))
+    stable_polynomials = np.array([np.poly(roots) for roots in left_roots])
+    unstable_polynomials = np.array([np.poly(np.r_[roots[:5], 0.5, 2.0]) for roots in left_roots])
+
+    assert RouthStabilitySolver.screen(stable_polynomials)[1].all()
+    assert RouthStabilitySolver.screen(unstable_polynomials)[0].tolist() == [2] * 500
+
+
+def test_zero_row_with_negative_auxiliary_coefficients():
+    # 2s^4 - s^3 - 4s^2 + s + 2 = (s - 1)(s + 1)(2s^2 - s - 2), two roots in the right half plane
+    assert RouthStabilitySolver.screen([[2, -1, -4, 1, 2]])[0].tolist() == [2]
+
+
+def test_marginally_stable_polynomials_are_not_stable():
+    # Roots on the imaginary axis or at the origin: no sign changes, but not asymptotically stable
+    marginal = [
+        [1, 0, 1],  # s^2 + 1
+        [1, 0, 0],  # s^2
+        [1, 2, 0],  # s(s + 2)
+        [1, 0, 3, 0, 2],  # s^4 + 3s^2 + 2
+        [1, 0, 4, 0, 3],  # (s^2 + 1)(s^2 + 3)
+        [1, 1, 1, 1],  # (s + 1)(s^2 + 1)
+        [1, 3, 3, 1, 0],  # s(s + 1)^3, zero constant term
+    ]
+    for coeffs in marginal:
+        sign_changes, stable = RouthStabilitySolver.screen([coeffs])
+
+        assert sign_changes.tolist() == [0]
+        assert stable.tolist() == [False]
+        assert RouthStabilitySolver(coeffs).is_stable() is False
+
+    # Same batch size mixing a marginal polynomial with a stable one
+    assert RouthStabilitySolver.screen([[1, 1, 1, 1], [1, 3, 3, 1]])[1].tolist() == [False, True]
+
+
+def test_symbolic_stability_is_undetermined():
+    solver = RouthStabilitySolver([1, 3, 3, sp.Symbol('K')])
+
+    assert solver.is_stable() is None
+    assert solver.solve()[0] is not None
+
+
+def test_steps_do_not_accumulate_between_solves():
+    solver = RouthStabilitySolver([1, 2, 3, 4, 5])
+    first = len(solver.solve()[3])
+    assert len(solver.solve()[3]) == first
+
+
+def test_screen_rejects_flat_input():
+    with pytest.raises(ValueError):
+        RouthStabilitySolver.screen([1, 2, 3])
@@ -0,0 +1,80 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+
+
+def test_integer_coefficients_use_exact_fractions():
+    # s^4 + 2s^3 + 3s^2 + 4s + 5: first column 1, 2, 1, -6, 5
+    sign_change, rhp_roots, equation, steps = RouthStabilitySolver([1, 2, 3, 4, 5]).solve()
+
+    final_table = steps[-1]
+    assert sign_change == 2
+    assert len(rhp_roots) == 2
+    assert equation.endswith('=0')
+    assert [row[1] for row in final_table] == [1, 2, 1, -6, 5]
+    assert all(isinstance(value, Fraction) for value in final_table[2][1:])
+    assert steps[1][2][1] == "\\frac{2 \\cdot 3 - 1 \\cdot 4}{2} = 1"
+
+
+def test_zero_pivot_falls_back_to_epsilon():
+    # s^4 + s^3 + 2s^2 + 2s + 3 has a zero in the first column of the s^2 row
+    sign_change, _, _, steps = RouthStabilitySolver([1, 1, 2, 2, 3]).solve()
+
+    assert sign_change == 2
+    assert 'ε' in str(steps[-1][2][1])
+
+
+def test_stable_polynomial():
+    sign_change, rhp_roots, _, steps = RouthStabilitySolver([1, 6, 11, 6]).solve()
+
+    assert sign_change == 0
+    assert rhp_roots == []
+    assert [row[1] for row in steps[-1]] == [1, 6, 10, 6]
+
+
+def test_numeric_roots_for_high_order():
+    # (s - 1)(s - 2)(s^2 - 2s + 5) times eight left half plane roots
+    coeffs = [int(round(value)) for value in np.poly([1, 2, 1 + 2j, 1 - 2j, -1, -2, -3, -4, -5, -6, -7, -8]).real]
+
+    sign_change, rhp_roots, _, _ = RouthStabilitySolver(coeffs).solve()
+
+    assert sign_change == 4
+    assert rhp_roots == ['1.0 + (-2.0)\\cdot\\mathrm{i}', '1.0', '1.0 + (2.0)\\cdot\\mathrm{i}', '2.0']
+
+
+def test_symbolic_roots_are_opt_in():
+    coeffs = [1, -2, 3]
+    numeric = RouthStabilitySolver(coeffs).solve()[1]
+    symbolic = RouthStabilitySolver(coeffs, symbolic_roots=True).solve()[1]
+
+    assert len(numeric) == len(symbolic) == 2
+    assert all(root.startswith('1.0 + (') for root in numeric + symbolic)
+
+
+def test_repeated_rhp_roots_are_reported_once():
+    # (s - 1)^3 (s^2 - 4s + 5)^2 (s + 1): a triple real root and a double complex pair
+    coeffs = [int(round(value)) for value in np.poly([1, 1, 1, 2 + 1j, 2 - 1j, 2 + 1j, 2 - 1j, -1]).real]
+
+    numeric = RouthStabilitySolver(coeffs).solve()[1]
+    symbolic = RouthStabilitySolver(coeffs, symbolic_roots=True).solve()[1]
+
+    assert numeric == ['1.0', '2.0 + (-1.0)\\cdot\\mathrm{i}', '2.0 + (1.0)\\cdot\\mathrm{i}']
+    assert sorted(numeric) == sorted(symbolic)
+
+    # Float coefficients keep the repeated factor only approximately, the split roots are merged
+    assert len(RouthStabilitySolver([1.0, -0.3, 0.03, -0.001]).solve()[1]) == 1
+
+
+def test_close_exact_rhp_roots_are_not_merged():
+    # (s - 1)(s - 1.000001)(s + 1): exact coefficients, two distinct RHP roots 1e-6 apart
+    coeffs = [1000000, -1000001, -1000000, 1000001]
+
+    sign_changes, numeric, _, _ = RouthStabilitySolver(coeffs).solve()
+
+    assert sign_changes == 2
+    assert RouthStabilitySolver(coeffs, symbolic_roots=True).solve()[1] == ['1.0', '1.000001']
+    assert len(numeric) == 2
+    assert [float(root) for root in numeric] == pytest.approx([1.0, 1.000001], abs=1e-8)
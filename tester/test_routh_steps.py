@@ -0,0 +1,51 @@
+import sympy as sp
+
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+from Routh_Stability.Routh_Steps import RouthSteps
+
+
+def test_snapshots_round_trip():
+    for coeffs in ([1, 2, 3, 4, 5], [1, 0, 3, 0, 2], [1, 1, 2, 2, 3], [2, -1, 4, 7, 1, 3, 5]):
+        snapshots = list(RouthStabilitySolver(coeffs).solve()[3])
+        steps = RouthSteps.from_snapshots(snapshots)
+
+        assert len(steps) == len(snapshots)
+        assert list(steps) == snapshots
+        assert steps[-1] == snapshots[-1]
+
+
+def test_only_changed_rows_are_stored():
+    steps = RouthStabilitySolver([1, 2, 3, 4, 5]).solve()[3]
+
+    assert steps.row_count == 5 and steps.column_count == 4
+    assert steps.changed_rows(0) == [0, 1, 2, 3, 4]
+    # Step 2 fills in the S² values and shows the formulas of S¹
+    assert steps.changed_rows(2) == [2, 3]
+    assert steps.row(2, 0) is steps.row(4, 0)
+    assert steps.row(2, 3)[1] == "\\frac{1 \\cdot 4 - 2 \\cdot 5}{1} = -6"
+
+
+def test_epsilon_and_auxiliary_events_replay():
+    # s^4 + 3s^2 + 2: zero s^3 row start (ε), then a zero row replaced by the auxiliary row derivative
+    solver = RouthStabilitySolver([1, 0, 3, 0, 2])
+    steps = solver.solve()[3]
+    ε = sp.Symbol('ε')
+
+    kinds = [event[0] for event in solver.step_log.events]
+    assert kinds[0] == 'epsilon' and 'auxiliary' in kinds
+    assert len(steps) == 5
+    assert steps[0][1] == ['S³', ε, 0, 0]
+    assert steps[2][3] == [
+        'S¹', '\\mathrm{coeff}\\left(\\frac{d}{ds} 3\\cdot S^2\\right) = 6',
+        '\\mathrm{coeff}\\left(\\frac{d}{ds} 2\\cdot S^0\\right) = 0', '0'
+    ]
+    assert steps[-1] == [['S⁴', 1, 3, 2], ['S³', ε, 0, 0], ['S²', 3, 2, 0], ['S¹', 6, 0, 0], ['S⁰', 2, 0, 0]]
+
+
+def test_steps_can_be_switched_off():
+    for coeffs in ([1, 2, 3, 4, 5], [1, 0, 3, 0, 2]):
+        solver = RouthStabilitySolver(coeffs, record_steps=False)
+        sign_change, _, _, steps = solver.solve()
+
+        assert steps is None and solver.step_log is None
+        assert sign_change == RouthStabilitySolver(coeffs).solve()[0]
@@ -0,0 +1,62 @@
+import cProfile
+
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from LogicalComputation.Solve_Stats import SolveStats
+from Routh_Stability.Routh_Stability_Criterion_Solver import RouthStabilitySolver
+from tester.graph_factories import random_graph
+
+
+def test_signal_flow_stages_and_counts():
+    stats = SolveStats()
+    extractor = solver(random_graph(2, size=7), stats=stats)
+    extractor.extract_paths_and_loops()
+    SignalFlowAnalyzer(stats=stats).solve(extractor.loops, extractor.paths)
+
+    stages = stats.stages
+    for name in ('paths', 'loops', 'loops.components', 'loops.merge_parallel_edges',
+                 'non_touching', 'delta', 'path_deltas', 'division'):
+        assert stages[name]['calls'] == 1 and stages[name]['time'] >= 0
+    assert stages['loops']['time'] >= stages['loops.merge_parallel_edges']['time']
+
+    counts = stats.counts
+    assert counts['paths'] == len(extractor.paths)
+    assert counts['loops'] == len(extractor.loops)
+    assert counts['combinations'] >= counts['loops']
+
+
+def test_routh_limit_handling_is_counted():
+    stats = SolveStats()
+    RouthStabilitySolver([1, 2, 3, 6, 5, 3], stats=stats).solve()  # Zero pivot in the s³ row
+
+    assert set(stats.stages) >= {'table', 'table.exact', 'table.limits', 'roots'}
+    assert stats.counts['limits'] > 0
+    assert stats.counts['rhp_roots'] == 2
+
+    plain = SolveStats()
+    RouthStabilitySolver([1, 2, 3, 4], stats=plain).solve()
+    assert 'table.limits' not in plain.stages and 'limits' not in plain.counts
+
+
+def test_profiler_hook_runs_inside_stages_only():
+    stats = SolveStats(profiler=True)
+    RouthStabilitySolver([1, 2, 3, 6, 5, 3], stats=stats).solve()
+
+    assert isinstance(stats.profiler, cProfile.Profile)
+    report = stats.report()
+    assert 'table.limits' in report and 'limit' in report
+
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def start(self):
+            self.events.append('start')
+
+        def stop(self):
+            self.events.append('stop')
+
+    recorder = Recorder()
+    stats = SolveStats(profiler=recorder)
+    RouthStabilitySolver([1, 1, 2, 8], stats=stats).solve()
+    assert recorder.events == ['start', 'stop'] * 2  # table, then roots
@@ -0,0 +1,44 @@
+from itertools import islice
+
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from tester.graph_factories import random_graph
+
+
+def test_streams_match_extracted_records():
+    graph = random_graph(5)
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+
+    paths = [(nodes, weight) for nodes, weight, _ in extractor.iter_paths()]
+    loops = [(nodes, weight) for nodes, weight, _ in extractor.iter_loops()]
+    assert [path["path"] for path in extractor.paths] == [[graph.node_ids[i] for i in nodes] for nodes, _ in paths]
+    assert [loop["weight"] for loop in extractor.loops] == [weight for _, weight in loops]
+    assert not extractor.truncated
+
+
+def test_max_count_stops_after_prefix():
+    extractor = solver(random_graph(5))
+    everything = list(extractor.iter_loops())
+    assert list(extractor.iter_loops(max_count=7)) == everything[:7]
+    assert extractor.truncated
+    assert list(islice(extractor.iter_paths(), 3)) == list(extractor.iter_paths(max_count=3))
+
+
+def test_max_length_keeps_every_short_record():
+    extractor = solver(random_graph(5))
+    for max_length in (0, 1, 2, 3, 4):
+        assert list(extractor.iter_loops(max_length=max_length)) == [
+            record for record in extractor.iter_loops() if len(record[0]) - 1 <= max_length
+        ]
+        assert list(extractor.iter_paths(max_length=max_length)) == [
+            record for record in extractor.iter_paths() if len(record[0]) - 1 <= max_length
+        ]
+    assert not list(extractor.iter_paths(max_length=0)) and extractor.truncated
+    assert not list(extractor.iter_loops(max_length=0)) and extractor.truncated
+
+
+def test_timeout_cuts_search():
+    extractor = solver(random_graph(7, size=16, density=0.5))
+    loops = list(extractor.iter_loops(timeout=0))
+    assert extractor.truncated
+    assert len(loops) < 1024
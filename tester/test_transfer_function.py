@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from sympy import symbols
+
+from LogicalComputation.Compact_Graph import CompactGraph
+from LogicalComputation.Loops_and_Path_Extractor import solver
+from LogicalComputation.Signal_Flow_Graph_Solver import SignalFlowAnalyzer
+from LogicalComputation.Transfer_Function import TransferFunction, compile_expression
+
+
+def test_batched_gain_sweep_matches_subs():
+    G1, G2, H = symbols('G1 G2 H')
+    extractor = solver(CompactGraph.from_dict({
+        'R': {'A': G1},
+        'A': {'B': G2},
+        'B': {'A': -H, 'C': 1},
+    }))
+    extractor.extract_paths_and_loops()
+
+    analyzer = SignalFlowAnalyzer()
+    _, _, _, result = analyzer.solve(extractor.loops, extractor.paths)
+    transfer_function = analyzer.transfer_function
+
+    gains = np.linspace(0.5, 4, 8)
+    values = transfer_function(G1=gains[:, None], G2=2.0, H=gains[None, :])
+
+    assert values.shape == (8, 8)
+    assert transfer_function.variables == (G1, G2, H)
+    assert np.isclose(values[3, 5], float(result.subs({G1: gains[3], G2: 2, H: gains[5]})))
+
+    with pytest.raises(ValueError, match='H'):
+        transfer_function(G1=1, G2=1)
+
+
+def test_compiled_functions_are_shared_between_equal_expressions():
+    s = symbols('s')
+    first = TransferFunction(s + 1, s ** 2 + 3)
+    second = TransferFunction(s + 1, s ** 2 + 3)
+
+    first(s=1.0)
+    hits = compile_expression.cache_info().hits
+    second(s=2.0)
+
+    assert compile_expression.cache_info().hits == hits + 2
+
+
+def test_result_simplified_once_on_request():
+    s = symbols('s')
+    graph = CompactGraph.from_dict({'R': {'A': 1 / (s + 1)}, 'A': {'A': -1 / (s + 1), 'C': s + 1}})
+    extractor = solver(graph)
+    extractor.extract_paths_and_loops()
+
+    _, _, _, raw = SignalFlowAnalyzer().solve(extractor.loops, extractor.paths)
+    _, _, _, simplified = SignalFlowAnalyzer(simplify_result=True).solve(extractor.loops, extractor.paths)
+
+    assert extractor.loops[0]['weight'] == -1 / (s + 1)
+    assert (raw - simplified).simplify() == 0
+    assert simplified == (s + 1) / (s + 2)
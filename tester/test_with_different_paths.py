@@ -6,6 +6,7 @@ class MockEdge:
     def __init__(self, source, target, weight):
         self.source = source
         self.target = target
+        self.end_node = target
         self.weight = weight
 
 class MockNode: